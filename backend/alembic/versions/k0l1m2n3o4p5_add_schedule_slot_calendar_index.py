@@ -0,0 +1,30 @@
+"""Add composite index for schedule slot calendar lookups
+
+Revision ID: k0l1m2n3o4p5
+Revises: bdd925ff9ef7
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k0l1m2n3o4p5'
+down_revision: Union[str, None] = 'bdd925ff9ef7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_slot_channel_active_date',
+        'schedule_slots',
+        ['channel_id', 'is_active', 'start_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_slot_channel_active_date', table_name='schedule_slots')
@@ -0,0 +1,46 @@
+"""Add partial indexes for active playlist and group listings
+
+Revision ID: l1m2n3o4p5q6
+Revises: k0l1m2n3o4p5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l1m2n3o4p5q6'
+down_revision: Union[str, None] = 'k0l1m2n3o4p5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, таблица, колонки); все индексы частичные — WHERE is_active
+INDEXES = [
+    ('ix_playlists_user_active_name', 'playlists', ['user_id', 'name']),
+    ('ix_playlists_group_active_pos', 'playlists', ['group_id', 'position', 'name']),
+    ('ix_playlist_groups_user_active_pos', 'playlist_groups', ['user_id', 'position', 'name']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text('is_active'),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
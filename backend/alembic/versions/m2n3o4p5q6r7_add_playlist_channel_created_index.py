@@ -0,0 +1,40 @@
+"""Add partial index for the newest active playlist of a channel
+
+Revision ID: m2n3o4p5q6r7
+Revises: l1m2n3o4p5q6
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'm2n3o4p5q6r7'
+down_revision: Union[str, None] = 'l1m2n3o4p5q6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицу, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_playlists_channel_active_created',
+            'playlists',
+            ['channel_id', 'created_at'],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_playlists_channel_active_created',
+            table_name='playlists',
+            postgresql_concurrently=True,
+        )
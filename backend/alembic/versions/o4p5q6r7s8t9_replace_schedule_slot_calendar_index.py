@@ -0,0 +1,65 @@
+"""Replace the slot calendar index with a partial index ordered by time
+
+Revision ID: o4p5q6r7s8t9
+Revises: m2n3o4p5q6r7
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'o4p5q6r7s8t9'
+down_revision: Union[str, None] = 'm2n3o4p5q6r7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицу, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        # Диапазон дат канала в порядке (start_date, start_time) читается
+        # проходом по индексу без сортировки; end_time в индексе — для
+        # index-only scan календаря, playlist_id в INCLUDE — для текущего
+        # слота стримера
+        op.create_index(
+            'ix_slot_channel_active_date_time',
+            'schedule_slots',
+            ['channel_id', 'start_date', 'start_time', 'end_time'],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_include=['playlist_id'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_slot_channel_active_date',
+            table_name='schedule_slots',
+            postgresql_concurrently=True,
+        )
+        # Отдельный индекс текущего слота стримера теперь покрыт индексом
+        # выше; он мог остаться в базах, где его уже создавали
+        op.drop_index(
+            'ix_slot_channel_playlist_lookup',
+            table_name='schedule_slots',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_slot_channel_active_date',
+            'schedule_slots',
+            ['channel_id', 'is_active', 'start_date'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_slot_channel_active_date_time',
+            table_name='schedule_slots',
+            postgresql_concurrently=True,
+        )
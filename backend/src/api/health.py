@@ -58,7 +58,7 @@ class ReadinessResponse(BaseModel):
 
 def check_database() -> DependencyHealth:
     """Проверка доступности PostgreSQL."""
-    from src.database import get_db, SessionLocal
+    from src.database import get_db, SessionLocal, engine
     
     start = time.time()
     try:
@@ -73,7 +73,9 @@ def check_database() -> DependencyHealth:
                     name="database",
                     status="degraded",
                     latency_ms=round(latency, 2),
-                    message="High latency detected",
+                    # Состояние пула помогает отличить медленную БД
+                    # от исчерпанного пула соединений
+                    message=f"High latency detected ({engine.pool.status()})",
                     last_check=datetime.now(timezone.utc).isoformat()
                 )
             
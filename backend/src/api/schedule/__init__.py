@@ -7,6 +7,7 @@ Schedule API module — управление расписанием трансл
 - slots: API для слотов расписания
 - templates: API для шаблонов
 - playlists: API для плейлистов
+- groups: API для групп плейлистов
 - router: Агрегация роутеров
 
 Backward compatibility:
@@ -20,19 +21,34 @@ from src.api.schedule.schemas import (
     ScheduleSlotCreate,
     ScheduleSlotUpdate,
     ScheduleSlotResponse,
+    slot_response_fields,
+    slot_to_response,
     ScheduleTemplateCreate,
     ScheduleTemplateResponse,
     PlaylistCreate,
     PlaylistUpdate,
+    PlaylistItemsPatch,
     PlaylistResponse,
+    PlaylistGroupCreate,
+    PlaylistGroupUpdate,
+    PlaylistGroupResponse,
+    PlaylistGroupWithPlaylistsResponse,
     BulkCopyRequest,
     ApplyTemplateRequest,
     CalendarViewResponse,
 )
 from src.api.schedule.utils import (
     parse_time,
+    parse_uuid,
     format_time,
+    now_utc,
     check_slot_overlap,
+    get_playlist_names,
+    lock_channel_schedule,
+    load_day_intervals,
+    BusyIntervals,
+    expand_occurrences_stmt,
+    occurrence_weekdays,
 )
 
 __all__ = [
@@ -43,16 +59,31 @@ __all__ = [
     "ScheduleSlotCreate",
     "ScheduleSlotUpdate",
     "ScheduleSlotResponse",
+    "slot_response_fields",
+    "slot_to_response",
     "ScheduleTemplateCreate",
     "ScheduleTemplateResponse",
     "PlaylistCreate",
     "PlaylistUpdate",
+    "PlaylistItemsPatch",
     "PlaylistResponse",
+    "PlaylistGroupCreate",
+    "PlaylistGroupUpdate",
+    "PlaylistGroupResponse",
+    "PlaylistGroupWithPlaylistsResponse",
     "BulkCopyRequest",
     "ApplyTemplateRequest",
     "CalendarViewResponse",
     # Utils
     "parse_time",
+    "parse_uuid",
     "format_time",
+    "now_utc",
     "check_slot_overlap",
+    "get_playlist_names",
+    "lock_channel_schedule",
+    "load_day_intervals",
+    "BusyIntervals",
+    "expand_occurrences_stmt",
+    "occurrence_weekdays",
 ]
@@ -0,0 +1,365 @@
+"""
+Кэши ответов Schedule API.
+
+Календарь запрашивается при каждой навигации в UI, а слоты меняются
+редко. Готовый JSON месяца хранится в памяти процесса с коротким TTL.
+Изменяющие эндпоинты слотов и шаблонов сбрасывают кэш канала явно;
+изменения, сделанные через другой воркер, становятся видны не позже
+истечения TTL.
+
+Активный плейлист канала (опрашивается стримером) кэшируется в памяти
+процесса по 30-секундным окнам времени вместе с ETag тела ответа.
+Изменения, сделанные через другой воркер, становятся видны не позже
+конца текущего окна.
+
+Списки плейлистов и групп кэшируются в Redis (общем для всех воркеров)
+и сбрасываются изменяющими эндпоинтами по пользователю. Там же хранится
+развёрнутое расписание (/expand), ключ которого включает версию слотов
+канала.
+"""
+
+import hashlib
+import logging
+import time
+import uuid
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from src.lib.redis_utils import SyncRedisService
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_CACHE_TTL = 30
+CALENDAR_CACHE_MAX_ENTRIES = 1024
+
+# (channel_id, year, month) -> (expires_at, body)
+_calendar_cache: Dict[Tuple[uuid.UUID, int, int], Tuple[float, bytes]] = {}
+
+
+def get_cached_calendar(
+    channel_id: uuid.UUID,
+    year: int,
+    month: int
+) -> Optional[bytes]:
+    """
+    Получение закэшированного календаря месяца.
+
+    Args:
+        channel_id: ID канала
+        year: Год
+        month: Месяц
+
+    Returns:
+        JSON-тело ответа или None, если кэша нет или он истёк
+    """
+    entry = _calendar_cache.get((channel_id, year, month))
+    if entry is None:
+        return None
+    expires_at, body = entry
+    if expires_at < time.monotonic():
+        return None
+    return body
+
+
+def set_cached_calendar(
+    channel_id: uuid.UUID,
+    year: int,
+    month: int,
+    body: bytes
+) -> None:
+    """
+    Сохранение календаря месяца в кэш.
+
+    Args:
+        channel_id: ID канала
+        year: Год
+        month: Месяц
+        body: JSON-тело ответа
+    """
+    now = time.monotonic()
+    if len(_calendar_cache) >= CALENDAR_CACHE_MAX_ENTRIES:
+        for key in [k for k, v in _calendar_cache.items() if v[0] < now]:
+            del _calendar_cache[key]
+        if len(_calendar_cache) >= CALENDAR_CACHE_MAX_ENTRIES:
+            _calendar_cache.clear()
+    _calendar_cache[(channel_id, year, month)] = (now + CALENDAR_CACHE_TTL, body)
+
+
+def invalidate_calendar(channel_id: uuid.UUID) -> None:
+    """
+    Сброс кэша календаря всех месяцев канала.
+
+    Args:
+        channel_id: ID канала
+    """
+    for key in [k for k in _calendar_cache if k[0] == channel_id]:
+        _calendar_cache.pop(key, None)
+
+
+ACTIVE_PLAYLIST_WINDOW = 30
+ACTIVE_PLAYLIST_MAX_ENTRIES = 1024
+# Cache-Control max-age ответа стримеру: половина окна, чтобы клиентский
+# кэш не переживал смену слота дольше, чем серверный
+ACTIVE_PLAYLIST_MAX_AGE = 15
+
+# channel_id -> (window, body, etag)
+_active_playlist_cache: Dict[uuid.UUID, Tuple[int, bytes, str]] = {}
+
+
+def active_playlist_window(now: float) -> int:
+    """
+    Номер 30-секундного окна для момента времени.
+
+    Окна выровнены по началу минуты, а слоты расписания начинаются
+    и заканчиваются на границе минуты, поэтому внутри одного окна
+    активный слот канала не меняется.
+
+    Args:
+        now: Unix timestamp
+
+    Returns:
+        Номер окна
+    """
+    return int(now) // ACTIVE_PLAYLIST_WINDOW
+
+
+def get_cached_active_playlist(
+    channel_id: uuid.UUID,
+    window: int
+) -> Optional[Tuple[bytes, str]]:
+    """
+    Получение закэшированного активного плейлиста канала.
+
+    Args:
+        channel_id: ID канала
+        window: Текущее окно времени (active_playlist_window)
+
+    Returns:
+        (JSON-тело ответа, ETag) или None, если кэша нет или он из другого окна
+    """
+    entry = _active_playlist_cache.get(channel_id)
+    if entry is None or entry[0] != window:
+        return None
+    return entry[1], entry[2]
+
+
+def set_cached_active_playlist(
+    channel_id: uuid.UUID,
+    window: int,
+    body: bytes,
+    etag: str
+) -> None:
+    """
+    Сохранение активного плейлиста канала в кэш.
+
+    Args:
+        channel_id: ID канала
+        window: Окно времени, для которого построен ответ
+        body: JSON-тело ответа
+        etag: ETag тела ответа
+    """
+    if (
+        channel_id not in _active_playlist_cache
+        and len(_active_playlist_cache) >= ACTIVE_PLAYLIST_MAX_ENTRIES
+    ):
+        for key in [k for k, v in _active_playlist_cache.items() if v[0] != window]:
+            del _active_playlist_cache[key]
+        if len(_active_playlist_cache) >= ACTIVE_PLAYLIST_MAX_ENTRIES:
+            _active_playlist_cache.clear()
+    _active_playlist_cache[channel_id] = (window, body, etag)
+
+
+def invalidate_active_playlist(channel_id: Optional[uuid.UUID] = None) -> None:
+    """
+    Сброс кэша активного плейлиста.
+
+    Args:
+        channel_id: ID канала (None — сбросить для всех каналов, например
+            при изменении плейлиста, на который могут ссылаться слоты
+            любых каналов)
+    """
+    if channel_id is None:
+        _active_playlist_cache.clear()
+    else:
+        _active_playlist_cache.pop(channel_id, None)
+
+
+class ListCache(SyncRedisService):
+    """
+    Кэш JSON-ответов списков плейлистов и групп в Redis.
+    
+    Ключи: schedule:<kind>:<scope>:<channel_id>, где scope — ID пользователя
+    или "all" для списков, которые админы видят целиком; ключи списков scope
+    перечислены в множестве schedule:keys:<scope> для сброса. Развёрнутое
+    расписание: schedule:expand:<channel_id>:<start>:<end>:<версия>. При
+    недоступности Redis кэш на время отключается, и эндпоинты работают
+    напрямую с БД.
+    """
+    
+    TTL_SECONDS = 60
+    RETRY_AFTER_SECONDS = 30
+    
+    def __init__(self):
+        super().__init__(key_prefix="schedule")
+        self._retry_at = 0.0
+    
+    def _client(self):
+        """Redis клиент или None, если Redis недавно был недоступен."""
+        if time.monotonic() < self._retry_at:
+            return None
+        return self._get_redis()
+    
+    def _disable(self, error: Exception) -> None:
+        """Временно отключает кэш после ошибки Redis."""
+        logger.debug("Schedule list cache disabled: %s", error)
+        self._retry_at = time.monotonic() + self.RETRY_AFTER_SECONDS
+    
+    def _get_body(self, key: str) -> Optional[bytes]:
+        """JSON-тело по полному ключу или None."""
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            body = client.get(key)
+        except Exception as e:
+            self._disable(e)
+            return None
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return body
+    
+    def _set_body(self, key: str, body: bytes) -> None:
+        """Сохранение JSON-тела по полному ключу с TTL."""
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.setex(key, self.TTL_SECONDS, body)
+        except Exception as e:
+            self._disable(e)
+    
+    def get(self, kind: str, scope: str, channel_id: Optional[str]) -> Optional[bytes]:
+        """
+        Получение закэшированного JSON списка.
+        
+        Args:
+            kind: Тип списка ("playlists", "playlist-summaries", "groups")
+            scope: ID пользователя или "all"
+            channel_id: Фильтр по каналу (None — без фильтра)
+            
+        Returns:
+            JSON-тело ответа или None
+        """
+        return self._get_body(self._make_key(kind, scope, channel_id or "-"))
+    
+    def set(self, kind: str, scope: str, channel_id: Optional[str], body: bytes) -> None:
+        """
+        Сохранение JSON списка с TTL.
+        
+        Ключ добавляется в индекс scope (schedule:keys:<scope>), по которому
+        invalidate_user удаляет списки без SCAN по всему keyspace.
+        
+        Args:
+            kind: Тип списка ("playlists", "playlist-summaries", "groups")
+            scope: ID пользователя или "all"
+            channel_id: Фильтр по каналу (None — без фильтра)
+            body: JSON-тело ответа
+        """
+        client = self._client()
+        if client is None:
+            return
+        key = self._make_key(kind, scope, channel_id or "-")
+        index_key = self._make_key("keys", scope)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(key, self.TTL_SECONDS, body)
+            pipe.sadd(index_key, key)
+            # Индекс живёт не дольше последнего списка scope
+            pipe.expire(index_key, self.TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            self._disable(e)
+    
+    def _expand_key(
+        self,
+        channel_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        version: tuple
+    ) -> str:
+        """Ключ развёрнутого расписания; версия слотов входит в ключ хэшем."""
+        token = hashlib.blake2b(repr(version).encode(), digest_size=8).hexdigest()
+        return self._make_key(
+            "expand", str(channel_id), start_date.isoformat(), end_date.isoformat(), token
+        )
+    
+    def get_expanded(
+        self,
+        channel_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        version: tuple
+    ) -> Optional[bytes]:
+        """
+        Получение закэшированного развёрнутого расписания.
+        
+        Args:
+            channel_id: ID канала
+            start_date: Начало диапазона
+            end_date: Конец диапазона
+            version: Текущая версия слотов канала
+            
+        Returns:
+            JSON-тело ответа или None
+        """
+        return self._get_body(self._expand_key(channel_id, start_date, end_date, version))
+    
+    def set_expanded(
+        self,
+        channel_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        version: tuple,
+        body: bytes
+    ) -> None:
+        """
+        Сохранение развёрнутого расписания с TTL.
+        
+        Args:
+            channel_id: ID канала
+            start_date: Начало диапазона
+            end_date: Конец диапазона
+            version: Версия слотов, для которой построен ответ
+            body: JSON-тело ответа
+        """
+        self._set_body(self._expand_key(channel_id, start_date, end_date, version), body)
+    
+    def invalidate_user(self, user_id) -> None:
+        """
+        Сброс списков пользователя и общих списков админов.
+        
+        Args:
+            user_id: ID пользователя, чьи плейлисты или группы изменились
+        """
+        client = self._client()
+        if client is None:
+            return
+        try:
+            index_keys = [self._make_key("keys", scope) for scope in (str(user_id), "all")]
+            pipe = client.pipeline(transaction=False)
+            for index_key in index_keys:
+                pipe.smembers(index_key)
+            indexed = pipe.execute()
+            # Удаляются только прочитанные ключи: ключ, добавленный в индекс
+            # параллельно, остаётся в нём до следующего сброса
+            pipe = client.pipeline(transaction=False)
+            for index_key, keys in zip(index_keys, indexed):
+                if keys:
+                    pipe.delete(*keys)
+                    pipe.srem(index_key, *keys)
+            pipe.execute()
+        except Exception as e:
+            self._disable(e)
+
+
+list_cache = ListCache()
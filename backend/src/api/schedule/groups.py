@@ -0,0 +1,334 @@
+"""
+Эндпоинты для работы с группами плейлистов.
+
+Включает:
+- CRUD операции для PlaylistGroup
+- Список групп с вложенными плейлистами (для UI)
+- Перемещение плейлиста в группу с перенумерацией позиций
+
+Обработчики объявлены обычными def: они работают с синхронной сессией
+SQLAlchemy, и FastAPI выполняет их в пуле потоков, не блокируя event loop
+на время запросов к БД.
+"""
+import os
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import and_, case, func, insert, or_, select, update
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
+
+from src.database import get_db
+from src.models.user import User
+from src.models.schedule import Playlist, PlaylistGroup
+from src.api.auth import get_current_user
+from src.lib.responses import dumps
+
+from .cache import list_cache
+from .schemas import (
+    PlaylistResponse,
+    PlaylistGroupCreate,
+    PlaylistGroupUpdate,
+    PlaylistGroupResponse,
+    PlaylistGroupWithPlaylistsResponse,
+)
+
+router = APIRouter(tags=["schedule-groups"])
+
+_GROUP_WITH_PLAYLISTS_LIST = TypeAdapter(List[PlaylistGroupWithPlaylistsResponse])
+
+# При SQLALCHEMY_STRICT_LOADING=1 (тесты, разработка) незапланированная
+# ленивая загрузка связей групп падает с ошибкой сразу, а не превращается
+# незаметно в N+1 запросов. По умолчанию выключено: в рабочем окружении
+# лишний запрос лучше ответа 500
+_STRICT_LOADING = os.getenv("SQLALCHEMY_STRICT_LOADING", "").lower() in ("1", "true", "yes")
+
+# Количество активных плейлистов группы — коррелированный подзапрос,
+# который добавляется колонкой к запросу групп: счётчики приходят в тех же
+# строках, без загрузки плейлистов и без отдельного запроса
+_active_playlists_count = (
+    select(func.count(Playlist.id))
+    .where(Playlist.group_id == PlaylistGroup.id, Playlist.is_active == True)
+    .correlate(PlaylistGroup)
+    .scalar_subquery()
+    .label("playlists_count")
+)
+
+
+def _group_loader_options(*loaders) -> list:
+    """
+    Опции загрузки для запросов групп.
+    
+    Args:
+        *loaders: Явно нужные загрузчики связей (selectinload и т.п.)
+    
+    Returns:
+        Загрузчики плюс raiseload("*") для остальных связей при строгой загрузке
+    """
+    options = list(loaders)
+    if _STRICT_LOADING:
+        options.append(raiseload("*"))
+    return options
+
+
+def _visible_groups_query(db: Session, current_user: User, channel_id: Optional[uuid.UUID]):
+    """
+    Запрос активных групп, доступных пользователю.
+    
+    Args:
+        db: Сессия базы данных
+        current_user: Текущий пользователь
+        channel_id: Фильтр по каналу (плюс группы без канала)
+    
+    Returns:
+        Query по PlaylistGroup
+    """
+    query = db.query(PlaylistGroup)
+    # SuperAdmin и Admin видят группы всех пользователей
+    if not current_user.is_admin:
+        query = query.filter(PlaylistGroup.user_id == current_user.id)
+    
+    if channel_id:
+        query = query.filter(
+            or_(
+                PlaylistGroup.channel_id == channel_id,
+                PlaylistGroup.channel_id == None
+            )
+        )
+    
+    return query.filter(PlaylistGroup.is_active == True)
+
+
+def _reorder_group_playlists(
+    db: Session,
+    group_id: Optional[uuid.UUID],
+    moved: Playlist,
+    position: int
+) -> None:
+    """
+    Перенумерация активных плейлистов группы одним UPDATE.
+    
+    Перемещённый плейлист встаёт на позицию position перед плейлистом,
+    который занимал её раньше; позиции остальных сдвигаются и становятся
+    плотными (0, 1, 2, ...) через row_number().
+    
+    Args:
+        db: Сессия базы данных
+        group_id: ID группы (None — плейлисты владельца без группы)
+        moved: Перемещённый плейлист
+        position: Новая позиция перемещённого плейлиста
+    """
+    is_moved = Playlist.id == moved.id
+    if group_id is not None:
+        siblings = Playlist.group_id == group_id
+    else:
+        siblings = and_(Playlist.group_id == None, Playlist.user_id == moved.user_id)
+    reordered = select(
+        Playlist.id,
+        (func.row_number().over(order_by=(
+            case((is_moved, position), else_=func.coalesce(Playlist.position, 0)),
+            case((is_moved, 0), else_=1),
+            Playlist.name,
+        )) - 1).label("pos")
+    ).where(
+        siblings,
+        Playlist.is_active == True
+    ).cte("reordered")
+    
+    db.execute(
+        update(Playlist)
+        .where(Playlist.id == reordered.c.id)
+        .values(position=reordered.c.pos)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@router.get("/groups", responses={200: {"model": List[PlaylistGroupResponse]}})
+def get_playlist_groups(
+    channel_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Получить список групп плейлистов."""
+    scope = "all" if current_user.is_admin else str(current_user.id)
+    cache_channel = str(channel_id) if channel_id else None
+    cached = list_cache.get("groups", scope, cache_channel)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    rows = _visible_groups_query(db, current_user, channel_id).add_columns(
+        _active_playlists_count
+    ).options(
+        *_group_loader_options()
+    ).order_by(PlaylistGroup.position, PlaylistGroup.name).all()
+    
+    body = dumps([
+        PlaylistGroupResponse.model_validate(g).model_copy(
+            update={"playlists_count": playlists_count}
+        ).model_dump()
+        for g, playlists_count in rows
+    ])
+    list_cache.set("groups", scope, cache_channel, body)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/groups/with-playlists",
+    responses={200: {"model": List[PlaylistGroupWithPlaylistsResponse]}}
+)
+def get_playlist_groups_with_playlists(
+    channel_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Получить группы с вложенными плейлистами (для UI)."""
+    # Активные плейлисты всех групп загружаются одним дополнительным
+    # SELECT ... IN, уже отфильтрованными и упорядоченными по position в SQL
+    groups = _visible_groups_query(db, current_user, channel_id).options(
+        *_group_loader_options(
+            selectinload(PlaylistGroup.playlists.and_(Playlist.is_active == True))
+        )
+    ).order_by(PlaylistGroup.position, PlaylistGroup.name).all()
+    
+    # Вложенные плейлисты несут items целиком: JSON пишется pydantic-core
+    # сразу, без повторной валидации через response_model
+    body = _GROUP_WITH_PLAYLISTS_LIST.dump_json(
+        _GROUP_WITH_PLAYLISTS_LIST.validate_python(groups)
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/groups", response_model=PlaylistGroupResponse, status_code=201)
+def create_playlist_group(
+    group_data: PlaylistGroupCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Создать группу плейлистов."""
+    # Следующая позиция — MAX(position) + 1: одно обращение к индексу вместо
+    # COUNT по всем группам, и без повтора позиций после удаления групп.
+    # Считается подзапросом внутри INSERT ... RETURNING, так что создание
+    # группы — один запрос без отдельного SELECT и refresh
+    next_pos = select(
+        func.coalesce(func.max(PlaylistGroup.position), -1) + 1
+    ).where(
+        PlaylistGroup.user_id == current_user.id,
+        PlaylistGroup.is_active == True
+    ).scalar_subquery()
+    
+    group = db.execute(
+        insert(PlaylistGroup).values(
+            user_id=current_user.id,
+            channel_id=group_data.channel_id,
+            name=group_data.name,
+            description=group_data.description,
+            color=group_data.color,
+            icon=group_data.icon,
+            position=next_pos
+        ).returning(PlaylistGroup)
+    ).scalar_one()
+    # Ответ собирается до commit, пока атрибуты не сброшены сессией
+    response = PlaylistGroupResponse.model_validate(group)
+    
+    db.commit()
+    list_cache.invalidate_user(current_user.id)
+    
+    return response
+
+
+@router.put("/groups/{group_id}", response_model=PlaylistGroupResponse)
+def update_playlist_group(
+    group_id: uuid.UUID,
+    group_data: PlaylistGroupUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Обновить группу плейлистов."""
+    query = db.query(PlaylistGroup).filter(PlaylistGroup.id == group_id)
+    if not current_user.is_admin:
+        query = query.filter(PlaylistGroup.user_id == current_user.id)
+    group = query.first()
+    
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    
+    update_data = group_data.model_dump(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(group, key, value)
+    
+    db.commit()
+    list_cache.invalidate_user(group.user_id)
+    
+    # Перечитываем группу вместе со счётчиком одним запросом вместо refresh
+    group, playlists_count = db.query(PlaylistGroup, _active_playlists_count).filter(
+        PlaylistGroup.id == group.id
+    ).one()
+    
+    response = PlaylistGroupResponse.model_validate(group)
+    response.playlists_count = playlists_count
+    return response
+
+
+@router.delete("/groups/{group_id}", status_code=204)
+def delete_playlist_group(
+    group_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Удалить группу (soft delete). Плейлисты переносятся в ungrouped."""
+    # Для удаления нужны только ключи группы
+    query = db.query(PlaylistGroup).options(
+        load_only(PlaylistGroup.id, PlaylistGroup.user_id, PlaylistGroup.is_active)
+    ).filter(PlaylistGroup.id == group_id)
+    if not current_user.is_admin:
+        query = query.filter(PlaylistGroup.user_id == current_user.id)
+    group = query.first()
+    
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    
+    db.query(Playlist).filter(Playlist.group_id == group.id).update({Playlist.group_id: None})
+    group.is_active = False
+    db.commit()
+    list_cache.invalidate_user(group.user_id)
+    
+    return Response(status_code=204)
+
+
+@router.post("/playlists/{playlist_id}/move-to-group", response_model=PlaylistResponse)
+def move_playlist_to_group(
+    playlist_id: uuid.UUID,
+    group_id: Optional[uuid.UUID] = None,
+    position: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Переместить плейлист в группу."""
+    query = db.query(Playlist).filter(Playlist.id == playlist_id)
+    if not current_user.is_admin:
+        query = query.filter(Playlist.user_id == current_user.id)
+    playlist = query.first()
+    
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    if group_id:
+        group = db.query(PlaylistGroup.id).filter(
+            PlaylistGroup.id == group_id,
+            PlaylistGroup.is_active == True
+        ).first()
+        if not group:
+            raise HTTPException(status_code=404, detail="Group not found")
+    playlist.group_id = group_id
+    
+    if position is not None:
+        db.flush()
+        _reorder_group_playlists(db, playlist.group_id, playlist, position)
+    
+    db.commit()
+    list_cache.invalidate_user(playlist.user_id)
+    db.refresh(playlist)
+    
+    return PlaylistResponse.model_validate(playlist)
@@ -5,260 +5,446 @@
 - CRUD операции для Playlist
 - Привязка к каналам
 - Управление элементами плейлиста
+
+Обработчики объявлены обычными def: они работают с синхронной сессией
+SQLAlchemy, и FastAPI выполняет их в пуле потоков, не блокируя event loop
+на время запросов к БД.
 """
+import hashlib
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Integer, JSON, Numeric, bindparam, cast, func, insert, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 
 from src.database import get_db
 from src.models.user import User
 from src.models.schedule import ScheduleSlot, Playlist
 from src.api.auth import get_current_user
+from src.lib.responses import dumps
 
+from .cache import (
+    list_cache,
+    ACTIVE_PLAYLIST_MAX_AGE,
+    active_playlist_window,
+    get_cached_active_playlist,
+    set_cached_active_playlist,
+    invalidate_active_playlist,
+)
 from .schemas import (
     PlaylistCreate,
     PlaylistUpdate,
+    PlaylistItemsPatch,
     PlaylistResponse,
 )
+from .utils import now_utc
 
 router = APIRouter(tags=["schedule-playlists"])
 
+# Ответы с плейлистами сериализуются в JSON сразу pydantic-core (dump_json),
+# минуя jsonable_encoder FastAPI и промежуточные dict
+_PLAYLIST_LIST = TypeAdapter(List[PlaylistResponse])
+_PLAYLIST = TypeAdapter(PlaylistResponse)
 
-@router.get("/playlists", response_model=List[PlaylistResponse])
-async def get_playlists(
-    channel_id: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Получить список плейлистов."""
-    query = db.query(Playlist).filter(Playlist.user_id == current_user.id)
+# Запросы по ключу собраны один раз при импорте: значения передаются
+# bind-параметрами, а ключ кэша скомпилированного SQL у готового объекта
+# запроса вычисляется однократно, а не на каждый вызов
+_OWNED_PLAYLIST = select(Playlist).where(
+    Playlist.id == bindparam("playlist_id"),
+    Playlist.user_id == bindparam("user_id")
+)
+_OWNED_PLAYLIST_ID = select(Playlist.id).where(
+    Playlist.id == bindparam("playlist_id"),
+    Playlist.user_id == bindparam("user_id")
+)
+# Soft delete плейлиста, не занятого активными слотами: проверка владельца,
+# проверка использования и изменение — одним UPDATE. Имена параметров
+# не совпадают с колонками, иначе Core подставил бы их в SET
+_SOFT_DELETE_UNUSED_PLAYLIST = update(Playlist.__table__).where(
+    Playlist.id == bindparam("pid"),
+    Playlist.user_id == bindparam("uid"),
+    ~select(ScheduleSlot.id).where(
+        ScheduleSlot.playlist_id == Playlist.id,
+        ScheduleSlot.is_active == True
+    ).exists()
+).values(is_active=False).returning(Playlist.id)
+# Плейлисты активных слотов канала на текущее время
+_current_slot_playlist = Playlist.id.in_(
+    select(ScheduleSlot.playlist_id).where(
+        ScheduleSlot.channel_id == bindparam("channel_id"),
+        ScheduleSlot.is_active == True,
+        ScheduleSlot.start_date <= bindparam("current_date"),
+        ScheduleSlot.start_time <= bindparam("current_time"),
+        ScheduleSlot.end_time > bindparam("current_time"),
+        ScheduleSlot.playlist_id != None
+    )
+)
+# Плейлист для стримера одним запросом: среди активных плейлистов, которым
+# есть что играть (items_count поддерживается при каждой записи items),
+# плейлист текущего слота идёт раньше самого нового плейлиста канала.
+# JSON items читается только у выбранной строки
+_scheduled = _current_slot_playlist.label("scheduled")
+_STREAMER_PLAYLIST = select(Playlist, _scheduled).where(
+    Playlist.is_active == True,
+    or_(
+        Playlist.items_count > 0,
+        func.coalesce(Playlist.source_url, "") != ""
+    ),
+    or_(
+        _current_slot_playlist,
+        Playlist.channel_id == bindparam("channel_id")
+    )
+).order_by(
+    _scheduled.desc(),
+    Playlist.created_at.desc()
+).limit(1)
+
+# Колонки списка без items: JSON с элементами может весить мегабайты,
+# а для выбора плейлиста в UI нужны только метаданные и счётчики
+_PLAYLIST_SUMMARY_COLUMNS = (
+    Playlist.id,
+    Playlist.name,
+    Playlist.description,
+    Playlist.channel_id,
+    Playlist.group_id,
+    Playlist.position,
+    Playlist.color,
+    Playlist.source_type,
+    Playlist.source_url,
+    Playlist.items_count,
+    Playlist.total_duration,
+    Playlist.is_active,
+    Playlist.is_shuffled,
+    Playlist.created_at,
+)
+
+
+def _playlists_query(db: Session, user_id: uuid.UUID, channel_id: Optional[uuid.UUID]):
+    """
+    Запрос активных плейлистов пользователя, отсортированных по имени.
+    
+    Args:
+        db: Сессия базы данных
+        user_id: ID владельца
+        channel_id: Фильтр по каналу (плюс плейлисты без канала)
+        
+    Returns:
+        Query по Playlist
+    """
+    query = db.query(Playlist).filter(Playlist.user_id == user_id)
     
     if channel_id:
         query = query.filter(
             or_(
-                Playlist.channel_id == uuid.UUID(channel_id),
+                Playlist.channel_id == channel_id,
                 Playlist.channel_id == None
             )
         )
     
-    playlists = query.filter(Playlist.is_active == True).order_by(Playlist.name).all()
-    
-    return [
-        PlaylistResponse(
-            id=str(p.id),
-            name=p.name,
-            description=p.description,
-            channel_id=str(p.channel_id) if p.channel_id else None,
-            color=p.color,
-            source_type=p.source_type,
-            source_url=p.source_url,
-            items=p.items or [],
-            items_count=p.items_count,
-            total_duration=p.total_duration,
-            is_active=p.is_active,
-            is_shuffled=p.is_shuffled,
-            created_at=p.created_at
-        )
-        for p in playlists
-    ]
+    return query.filter(Playlist.is_active == True).order_by(Playlist.name)
 
 
-@router.post("/playlists", response_model=PlaylistResponse, status_code=201)
-async def create_playlist(
+def _apply_items_patch(items: Optional[list], patch: PlaylistItemsPatch) -> list:
+    """
+    Применение PlaylistItemsPatch к списку items в Python.
+    
+    Индексы вне списка игнорируются, как и оператором jsonb - integer.
+    
+    Args:
+        items: Текущие items
+        patch: Изменения
+        
+    Returns:
+        Новый список items
+    """
+    removed = set(patch.remove)
+    kept = [item for i, item in enumerate(items or []) if i not in removed]
+    return kept + patch.add
+
+
+def _items_patch_values(patch: PlaylistItemsPatch) -> dict:
+    """
+    SET-выражения UPDATE для PlaylistItemsPatch (только PostgreSQL).
+    
+    Новый items собирается в самом UPDATE операторами jsonb - integer
+    и ||: клиент и сервер передают только изменения, а не весь список,
+    и изменение атомарно относительно параллельных правок того же
+    плейлиста. items_count и total_duration считаются по тому же
+    выражению (total_duration — как в Playlist.items_stats).
+    
+    Args:
+        patch: Изменения
+        
+    Returns:
+        Словарь значений для update(Playlist).values()
+    """
+    items = cast(Playlist.items, JSONB)
+    # Удаляем с конца, чтобы индексы оставшихся не сдвигались
+    for index in sorted(set(patch.remove), reverse=True):
+        items = items.op("-", return_type=JSONB)(index)
+    if patch.add:
+        items = items.op("||", return_type=JSONB)(literal(patch.add, JSONB))
+    
+    elements = func.jsonb_array_elements(items).table_valued("value")
+    total_duration = select(
+        cast(func.trunc(func.coalesce(func.sum(
+            cast(elements.c.value.op("->>")("duration"), Numeric)
+        ), 0)), Integer)
+    ).scalar_subquery()
+    return {
+        "items": cast(items, JSON),
+        "items_count": func.jsonb_array_length(items),
+        "total_duration": total_duration,
+    }
+
+
+@router.get("/playlists", responses={200: {"model": List[PlaylistResponse]}})
+def get_playlists(
+    channel_id: Optional[uuid.UUID] = None,
+    include_items: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Получить список плейлистов.
+    
+    С include_items=false items не читаются из БД и отдаются пустыми
+    списками (items_count и total_duration остаются заполнены).
+    """
+    kind = "playlists" if include_items else "playlist-summaries"
+    scope = str(current_user.id)
+    cache_channel = str(channel_id) if channel_id else None
+    cached = list_cache.get(kind, scope, cache_channel)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    query = _playlists_query(db, current_user.id, channel_id)
+    if not include_items:
+        query = query.with_entities(*_PLAYLIST_SUMMARY_COLUMNS)
+    playlists = query.all()
+    
+    body = _PLAYLIST_LIST.dump_json(_PLAYLIST_LIST.validate_python(playlists))
+    list_cache.set(kind, scope, cache_channel, body)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/playlists/stream",
+    responses={200: {"content": {"application/x-ndjson": {}, "application/json": {}}}}
+)
+def stream_playlists(
+    channel_id: Optional[uuid.UUID] = None,
+    format: str = Query("ndjson", pattern="^(ndjson|json)$", description="ndjson или json-массив"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Потоковый список плейлистов.
+    
+    format=ndjson (по умолчанию) — один плейлист на строку; format=json —
+    обычный JSON-массив для клиентов без поддержки NDJSON, собираемый
+    по мере чтения строк.
+    
+    Для больших библиотек: строки читаются с сервера порциями по 500
+    (серверный курсор), поэтому в памяти не держится весь список вместе
+    с items, а клиент начинает получать данные после первой порции.
+    """
+    query = _playlists_query(db, current_user.id, channel_id).yield_per(500)
+    
+    def rows():
+        # Генератор выполняется уже после выхода из обработчика,
+        # поэтому сессию закрываем здесь, когда курсор прочитан
+        try:
+            for playlist in query:
+                yield _PLAYLIST.dump_json(PlaylistResponse.model_validate(playlist))
+        finally:
+            db.close()
+    
+    def ndjson():
+        for row in rows():
+            yield row + b"\n"
+    
+    def json_array():
+        yield b"["
+        for i, row in enumerate(rows()):
+            yield row if i == 0 else b"," + row
+        yield b"]"
+    
+    if format == "json":
+        return StreamingResponse(json_array(), media_type="application/json")
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/playlists", responses={201: {"model": PlaylistResponse}}, status_code=201)
+def create_playlist(
     playlist_data: PlaylistCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Создать новый плейлист."""
-    # Вычисляем статистику
     items = playlist_data.items or []
-    total_duration = sum(item.get("duration", 0) for item in items)
-    
-    playlist = Playlist(
-        user_id=current_user.id,
-        channel_id=uuid.UUID(playlist_data.channel_id) if playlist_data.channel_id else None,
-        name=playlist_data.name,
-        description=playlist_data.description,
-        color=playlist_data.color,
-        source_type=playlist_data.source_type,
-        source_url=playlist_data.source_url,
-        items=items,
-        items_count=len(items),
-        total_duration=total_duration,
-        is_shuffled=playlist_data.is_shuffled
-    )
     
-    db.add(playlist)
+    # INSERT ... RETURNING: строка со значениями по умолчанию (id, created_at)
+    # возвращается тем же запросом, без refresh после commit
+    playlist = db.execute(
+        insert(Playlist).values(
+            user_id=current_user.id,
+            channel_id=playlist_data.channel_id,
+            name=playlist_data.name,
+            description=playlist_data.description,
+            color=playlist_data.color,
+            source_type=playlist_data.source_type,
+            source_url=playlist_data.source_url,
+            items=items,
+            is_shuffled=playlist_data.is_shuffled,
+            **Playlist.items_stats(items)
+        ).returning(Playlist)
+    ).scalar_one()
+    # Ответ собирается до commit, пока атрибуты не сброшены сессией
+    body = _PLAYLIST.dump_json(PlaylistResponse.model_validate(playlist))
+    
     db.commit()
-    db.refresh(playlist)
-    
-    return PlaylistResponse(
-        id=str(playlist.id),
-        name=playlist.name,
-        description=playlist.description,
-        channel_id=str(playlist.channel_id) if playlist.channel_id else None,
-        color=playlist.color,
-        source_type=playlist.source_type,
-        source_url=playlist.source_url,
-        items=playlist.items or [],
-        items_count=playlist.items_count,
-        total_duration=playlist.total_duration,
-        is_active=playlist.is_active,
-        is_shuffled=playlist.is_shuffled,
-        created_at=playlist.created_at
-    )
+    list_cache.invalidate_user(current_user.id)
+    if playlist_data.channel_id:
+        invalidate_active_playlist(playlist_data.channel_id)
+    
+    return Response(content=body, status_code=201, media_type="application/json")
 
 
-@router.put("/playlists/{playlist_id}", response_model=PlaylistResponse)
-async def update_playlist(
-    playlist_id: str,
+@router.put("/playlists/{playlist_id}", responses={200: {"model": PlaylistResponse}})
+def update_playlist(
+    playlist_id: uuid.UUID,
     playlist_data: PlaylistUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Обновить плейлист."""
-    playlist = db.query(Playlist).filter(
-        Playlist.id == uuid.UUID(playlist_id),
-        Playlist.user_id == current_user.id
-    ).first()
-    
-    if not playlist:
-        raise HTTPException(status_code=404, detail="Playlist not found")
+    """
+    Обновить плейлист.
     
+    items заменяет список целиком; items_patch удаляет элементы по индексам
+    и добавляет новые в конец, не передавая весь список.
+    """
     update_data = playlist_data.model_dump(exclude_unset=True)
+    update_data.pop("items_patch", None)
+    patch = playlist_data.items_patch
     
     # Пересчитываем статистику при обновлении items
     if "items" in update_data:
-        items = update_data["items"] or []
-        update_data["items_count"] = len(items)
-        update_data["total_duration"] = sum(item.get("duration", 0) for item in items)
+        update_data.update(Playlist.items_stats(update_data["items"]))
+    elif patch is not None:
+        if db.get_bind().dialect.name == "postgresql":
+            update_data.update(_items_patch_values(patch))
+        else:
+            # Другие СУБД (SQLite в тестах): patch применяется в Python
+            current = db.execute(
+                select(Playlist.items).where(
+                    Playlist.id == playlist_id,
+                    Playlist.user_id == current_user.id
+                )
+            ).first()
+            if current is not None:
+                items = _apply_items_patch(current.items, patch)
+                update_data["items"] = items
+                update_data.update(Playlist.items_stats(items))
+    
+    # UPDATE ... RETURNING: проверка владельца, изменение и чтение
+    # обновлённой строки — один запрос, без SELECT до и refresh после
+    if update_data:
+        playlist = db.execute(
+            update(Playlist).where(
+                Playlist.id == playlist_id,
+                Playlist.user_id == current_user.id
+            ).values(**update_data).returning(Playlist)
+        ).scalar_one_or_none()
+    else:
+        # Пустое тело: менять нечего (и updated_at не трогаем)
+        playlist = db.execute(
+            _OWNED_PLAYLIST, {"playlist_id": playlist_id, "user_id": current_user.id}
+        ).scalar_one_or_none()
+    
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist not found")
     
-    for key, value in update_data.items():
-        setattr(playlist, key, value)
+    # Ответ собирается до commit, пока атрибуты не сброшены сессией
+    body = _PLAYLIST.dump_json(PlaylistResponse.model_validate(playlist))
     
     db.commit()
-    db.refresh(playlist)
-    
-    return PlaylistResponse(
-        id=str(playlist.id),
-        name=playlist.name,
-        description=playlist.description,
-        channel_id=str(playlist.channel_id) if playlist.channel_id else None,
-        color=playlist.color,
-        source_type=playlist.source_type,
-        source_url=playlist.source_url,
-        items=playlist.items or [],
-        items_count=playlist.items_count,
-        total_duration=playlist.total_duration,
-        is_active=playlist.is_active,
-        is_shuffled=playlist.is_shuffled,
-        created_at=playlist.created_at
-    )
+    list_cache.invalidate_user(current_user.id)
+    # Плейлист может стоять в слотах любых каналов
+    invalidate_active_playlist()
+    
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/playlists/{playlist_id}", status_code=204)
-async def delete_playlist(
-    playlist_id: str,
+def delete_playlist(
+    playlist_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Удалить плейлист (soft delete)."""
-    playlist = db.query(Playlist).filter(
-        Playlist.id == uuid.UUID(playlist_id),
-        Playlist.user_id == current_user.id
+    deleted = db.execute(
+        _SOFT_DELETE_UNUSED_PLAYLIST, {"pid": playlist_id, "uid": current_user.id}
     ).first()
     
-    if not playlist:
-        raise HTTPException(status_code=404, detail="Playlist not found")
-    
-    # Проверка использования в активных слотах
-    used = db.query(ScheduleSlot).filter(
-        ScheduleSlot.playlist_id == playlist.id,
-        ScheduleSlot.is_active == True
-    ).first()
-    if used:
+    if not deleted:
+        # Ничего не изменено: плейлиста нет (404) или он занят слотами (409)
+        owned = db.execute(
+            _OWNED_PLAYLIST_ID, {"playlist_id": playlist_id, "user_id": current_user.id}
+        ).first()
+        if not owned:
+            raise HTTPException(status_code=404, detail="Playlist not found")
         raise HTTPException(status_code=409, detail="Playlist is currently in use")
 
-    # Soft delete
-    playlist.is_active = False
     db.commit()
+    list_cache.invalidate_user(current_user.id)
+    invalidate_active_playlist()
 
     return Response(status_code=204)
 
 
-@router.get("/playlists/channel/{channel_id}/active")
-async def get_channel_active_playlist(
-    channel_id: str,
-    db: Session = Depends(get_db)
-):
+def _resolve_active_playlist(db: Session, channel_id: uuid.UUID, now: datetime) -> dict:
     """
-    Получить активный плейлист для канала (для стримера).
+    Поиск активного плейлиста канала на момент now.
     
-    Логика приоритетов:
-    1. Активный слот расписания на текущее время
-    2. Плейлист, привязанный к каналу
+    Логика приоритетов (выбирается одним запросом):
+    1. Плейлист активного слота расписания на текущее время
+    2. Самый новый плейлист, привязанный к каналу
     3. Пустой список если ничего не найдено
     
-    Не требует авторизации (внутренний API для стримера).
-    """
-    from datetime import datetime, timezone, time as time_type
-    
-    channel_uuid = uuid.UUID(channel_id)
-    now = datetime.now(timezone.utc)
-    current_date = now.date()
-    current_time = now.time()
+    В пп. 1–2 учитываются только плейлисты с элементами или source_url.
     
-    # 1. Ищем активный слот расписания на текущее время
-    active_slot = db.query(ScheduleSlot).filter(
-        ScheduleSlot.channel_id == channel_uuid,
-        ScheduleSlot.is_active == True,
-        ScheduleSlot.start_date <= current_date,
-        ScheduleSlot.start_time <= current_time,
-        ScheduleSlot.end_time > current_time,
-        ScheduleSlot.playlist_id != None
-    ).first()
-    
-    if active_slot and active_slot.playlist_id:
-        playlist = db.query(Playlist).filter(
-            Playlist.id == active_slot.playlist_id,
-            Playlist.is_active == True
-        ).first()
+    Args:
+        db: Сессия базы данных
+        channel_id: ID канала
+        now: Текущее время (UTC)
         
-        if playlist:
-            items = playlist.items or []
-            if not items and playlist.source_url:
-                items = [{"url": playlist.source_url, "title": playlist.name}]
-                
-            if items:
-                return {
-                    "source": "schedule",
-                    "playlist_id": str(playlist.id),
-                    "playlist_name": playlist.name,
-                    "is_shuffled": playlist.is_shuffled,
-                    "items": items
-                }
-    
-    # 2. Ищем плейлист, привязанный к каналу (берем первый с элементами)
-    channel_playlists = db.query(Playlist).filter(
-        Playlist.channel_id == channel_uuid,
-        Playlist.is_active == True
-    ).order_by(Playlist.created_at.desc()).limit(10).all()
-    
-    for pl in channel_playlists:
-        items = pl.items or []
-        if not items and pl.source_url:
-            items = [{"url": pl.source_url, "title": pl.name}]
+    Returns:
+        Словарь ответа для стримера
+    """
+    row = db.execute(_STREAMER_PLAYLIST, {
+        "channel_id": channel_id,
+        "current_date": now.date(),
+        "current_time": now.time(),
+    }).first()
+    
+    if row:
+        playlist, scheduled = row
+        items = playlist.items or []
+        if not items and playlist.source_url:
+            items = [{"url": playlist.source_url, "title": playlist.name}]
             
         if items:
             return {
-                "source": "channel",
-                "playlist_id": str(pl.id),
-                "playlist_name": pl.name,
-                "is_shuffled": pl.is_shuffled,
+                "source": "schedule" if scheduled else "channel",
+                "playlist_id": playlist.id,
+                "playlist_name": playlist.name,
+                "is_shuffled": playlist.is_shuffled,
                 "items": items
             }
     
@@ -270,3 +456,68 @@ async def get_channel_active_playlist(
         "is_shuffled": False,
         "items": []
     }
+
+
+def _active_playlist_etag(body: bytes) -> str:
+    """
+    ETag ответа стримеру.
+    
+    Хэш считается по самому телу, а не по id/updated_at плейлиста: ответ
+    меняется и при смене источника (слот расписания/канал) без изменения
+    плейлиста. blake2b с 8-байтовым дайджестом дёшев даже для тысяч items
+    и считается один раз на окно кэша.
+    
+    Args:
+        body: JSON-тело ответа
+        
+    Returns:
+        ETag в кавычках
+    """
+    return '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Совпадает ли If-None-Match с ETag (списки и слабые ETag учитываются)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+@router.get("/playlists/channel/{channel_id}/active")
+def get_channel_active_playlist(
+    channel_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(now_utc),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Получить активный плейлист для канала (для стримера).
+    
+    Не требует авторизации (внутренний API для стримера).
+    
+    Стример опрашивает эндпоинт постоянно, а ответ меняется только на
+    границах слотов, поэтому готовый JSON кэшируется на 30-секундное окно.
+    Ответ сериализуется orjson напрямую: items может содержать тысячи
+    элементов, и обход их через jsonable_encoder не нужен.
+    
+    Ответ снабжается ETag: клиент, приславший его в If-None-Match,
+    получает 304 без тела, пока плейлист не изменился.
+    """
+    window = active_playlist_window(now.timestamp())
+    cached = get_cached_active_playlist(channel_id, window)
+    if cached is None:
+        body = dumps(_resolve_active_playlist(db, channel_id, now))
+        etag = _active_playlist_etag(body)
+        set_cached_active_playlist(channel_id, window, body, etag)
+    else:
+        body, etag = cached
+    
+    headers = {"ETag": etag, "Cache-Control": f"max-age={ACTIVE_PLAYLIST_MAX_AGE}"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -5,20 +5,27 @@
 - slots: CRUD для слотов расписания
 - templates: управление шаблонами
 - playlists: управление плейлистами
+- groups: группы плейлистов
 """
 from fastapi import APIRouter
 
+from src.lib.responses import ORJSONResponse
+
 from .slots import router as slots_router
 from .templates import router as templates_router
 from .playlists import router as playlists_router
+from .groups import router as groups_router
 
-# Основной роутер расписания с prefix для совместимости
-router = APIRouter(prefix="/schedule")
+# Основной роутер расписания с prefix для совместимости.
+# Ответы сериализуются orjson и при подключении роутера к приложению
+# без default_response_class (например, в изолированных тестах)
+router = APIRouter(prefix="/schedule", default_response_class=ORJSONResponse)
 
 # Подключаем все подроутеры
 router.include_router(slots_router)
 router.include_router(templates_router)
 router.include_router(playlists_router)
+router.include_router(groups_router)
 
 # Экспорт для обратной совместимости
 __all__ = ["router"]
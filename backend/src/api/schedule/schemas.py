@@ -2,12 +2,15 @@
 Pydantic schemas для Schedule API.
 """
 
-from datetime import date, datetime
+import uuid
+from datetime import date, datetime, time
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from src.models.schedule import RepeatType
 
+from .utils import format_time
+
 
 class TimeSlotBase(BaseModel):
     """Базовый слот времени для шаблонов."""
@@ -20,8 +23,8 @@ class TimeSlotBase(BaseModel):
 
 class ScheduleSlotCreate(BaseModel):
     """Создание слота расписания."""
-    channel_id: str
-    playlist_id: Optional[str] = None
+    channel_id: uuid.UUID
+    playlist_id: Optional[uuid.UUID] = None
     start_date: date
     start_time: str  # "HH:MM"
     end_time: str    # "HH:MM"
@@ -36,7 +39,7 @@ class ScheduleSlotCreate(BaseModel):
 
 class ScheduleSlotUpdate(BaseModel):
     """Обновление слота расписания."""
-    playlist_id: Optional[str] = None
+    playlist_id: Optional[uuid.UUID] = None
     start_date: Optional[date] = None
     start_time: Optional[str] = None
     end_time: Optional[str] = None
@@ -71,12 +74,78 @@ class ScheduleSlotResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("id", "channel_id", "playlist_id", mode="before")
+    @classmethod
+    def _uuid_to_str(cls, v):
+        """UUID из ORM-модели приводится к строке."""
+        return str(v) if isinstance(v, uuid.UUID) else v
+
+    @field_validator("start_time", "end_time", mode="before")
+    @classmethod
+    def _time_to_str(cls, v):
+        """time из ORM-модели приводится к формату HH:MM."""
+        return format_time(v) if isinstance(v, time) else v
+
+
+def slot_response_fields(slot, playlist_name: Optional[str] = None) -> dict:
+    """
+    Поля ScheduleSlotResponse из ORM-слота, в порядке полей схемы.
+
+    UUID остаются объектами uuid.UUID — orjson сериализует их сам.
+
+    Args:
+        slot: Слот расписания (ScheduleSlot)
+        playlist_name: Название плейлиста слота
+
+    Returns:
+        Словарь полей ответа
+    """
+    return {
+        "id": slot.id,
+        "channel_id": slot.channel_id,
+        "playlist_id": slot.playlist_id,
+        "playlist_name": playlist_name,
+        "start_date": slot.start_date,
+        "start_time": format_time(slot.start_time),
+        "end_time": format_time(slot.end_time),
+        "repeat_type": slot.repeat_type,
+        "repeat_days": slot.repeat_days,
+        "repeat_until": slot.repeat_until,
+        "title": slot.title,
+        "description": slot.description,
+        "color": slot.color,
+        "is_active": slot.is_active,
+        "priority": slot.priority,
+        "created_at": slot.created_at,
+    }
+
+
+def slot_to_response(slot, playlist_name: Optional[str] = None) -> ScheduleSlotResponse:
+    """
+    ScheduleSlotResponse из ORM-слота без повторной валидации.
+
+    Данные из БД уже имеют типы схемы, поэтому модель собирается через
+    model_construct; UUID приводятся к строке, как требует схема.
+
+    Args:
+        slot: Слот расписания (ScheduleSlot)
+        playlist_name: Название плейлиста слота
+
+    Returns:
+        Ответ с данными слота
+    """
+    fields = slot_response_fields(slot, playlist_name)
+    fields["id"] = str(slot.id)
+    fields["channel_id"] = str(slot.channel_id)
+    fields["playlist_id"] = str(slot.playlist_id) if slot.playlist_id else None
+    return ScheduleSlotResponse.model_construct(**fields)
+
 
 class ScheduleTemplateCreate(BaseModel):
     """Создание шаблона расписания."""
     name: str
     description: Optional[str] = None
-    channel_id: Optional[str] = None
+    channel_id: Optional[uuid.UUID] = None
     slots: List[TimeSlotBase]
     is_public: bool = False
 
@@ -93,12 +162,18 @@ class ScheduleTemplateResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("id", "channel_id", mode="before")
+    @classmethod
+    def _uuid_to_str(cls, v):
+        """UUID из ORM-модели приводится к строке."""
+        return str(v) if isinstance(v, uuid.UUID) else v
+
 
 class PlaylistCreate(BaseModel):
     """Создание плейлиста."""
     name: str = Field(..., min_length=1)
     description: Optional[str] = None
-    channel_id: Optional[str] = None
+    channel_id: Optional[uuid.UUID] = None
     color: str = "#8B5CF6"
     source_type: str = "manual"
     source_url: Optional[str] = None
@@ -106,26 +181,48 @@ class PlaylistCreate(BaseModel):
     is_shuffled: bool = False
 
 
+class PlaylistItemsPatch(BaseModel):
+    """Частичное изменение items: удаление по индексам и добавление в конец."""
+    remove: List[int] = Field(default_factory=list)  # индексы в текущем items
+    add: List[dict] = Field(default_factory=list)
+
+    @field_validator("remove")
+    @classmethod
+    def _remove_indexes(cls, v):
+        if any(i < 0 for i in v):
+            raise ValueError("remove indexes must be non-negative")
+        return v
+
+
 class PlaylistUpdate(BaseModel):
     """Обновление плейлиста."""
     name: Optional[str] = None
     description: Optional[str] = None
     color: Optional[str] = None
     items: Optional[List[dict]] = None
+    items_patch: Optional[PlaylistItemsPatch] = None
     is_active: Optional[bool] = None
     is_shuffled: Optional[bool] = None
 
+    @model_validator(mode="after")
+    def _items_or_patch(self):
+        if self.items is not None and self.items_patch is not None:
+            raise ValueError("items and items_patch are mutually exclusive")
+        return self
+
 
 class PlaylistResponse(BaseModel):
     """Ответ с данными плейлиста."""
-    id: str
+    id: uuid.UUID
     name: str
     description: Optional[str]
-    channel_id: Optional[str]
+    channel_id: Optional[uuid.UUID]
+    group_id: Optional[uuid.UUID] = None
+    position: int = 0
     color: str
     source_type: str
     source_url: Optional[str]
-    items: List[dict]
+    items: List[dict] = Field(default_factory=list)
     items_count: int
     total_duration: int
     is_active: bool
@@ -134,18 +231,91 @@ class PlaylistResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("items", mode="before")
+    @classmethod
+    def _items_default(cls, v):
+        """items = NULL в БД отдаётся пустым списком."""
+        return v or []
+
+    @field_validator("position", mode="before")
+    @classmethod
+    def _position_default(cls, v):
+        return v or 0
+
+
+class PlaylistGroupCreate(BaseModel):
+    """Создание группы плейлистов."""
+    name: str = Field(..., min_length=1)
+    description: Optional[str] = None
+    channel_id: Optional[uuid.UUID] = None
+    color: str = "#6366F1"
+    icon: str = "folder"
+
+
+class PlaylistGroupUpdate(BaseModel):
+    """Обновление группы плейлистов."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    color: Optional[str] = None
+    icon: Optional[str] = None
+    position: Optional[int] = None
+    is_expanded: Optional[bool] = None
+    is_active: Optional[bool] = None
+
+
+class PlaylistGroupResponse(BaseModel):
+    """Ответ с данными группы плейлистов."""
+    id: uuid.UUID
+    name: str
+    description: Optional[str]
+    channel_id: Optional[uuid.UUID]
+    color: str
+    icon: str
+    position: int
+    is_expanded: bool
+    is_active: bool
+    playlists_count: int = 0
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("icon", mode="before")
+    @classmethod
+    def _icon_default(cls, v):
+        return v or "folder"
+
+    @field_validator("position", mode="before")
+    @classmethod
+    def _position_default(cls, v):
+        return v or 0
+
+    @field_validator("is_expanded", mode="before")
+    @classmethod
+    def _is_expanded_default(cls, v):
+        return True if v is None else v
+
+
+class PlaylistGroupWithPlaylistsResponse(PlaylistGroupResponse):
+    """Группа с вложенными плейлистами."""
+    playlists: List[PlaylistResponse] = []
+
+    @model_validator(mode="after")
+    def _count_playlists(self):
+        self.playlists_count = len(self.playlists)
+        return self
+
 
 class BulkCopyRequest(BaseModel):
     """Запрос на копирование расписания."""
     source_date: date
     target_dates: List[date]
-    channel_id: str
+    channel_id: uuid.UUID
 
 
 class ApplyTemplateRequest(BaseModel):
     """Запрос на применение шаблона."""
-    template_id: str
-    channel_id: str
+    template_id: uuid.UUID
+    channel_id: uuid.UUID
     target_dates: List[date]
 
 
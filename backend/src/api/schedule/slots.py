@@ -6,14 +6,19 @@
 - Календарный вид
 - Развертывание повторяющихся слотов
 - Массовое копирование
+
+Обработчики — обычные def: синхронная сессия SQLAlchemy и синхронный
+клиент Redis (кэш развёртки) работают в пуле потоков FastAPI и не
+останавливают event loop.
 """
 import uuid
 from datetime import date, timedelta
+from operator import itemgetter
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import Response
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, case, delete, func, insert, select
 from sqlalchemy.orm import Session
 
 from src.database import get_db
@@ -21,22 +26,59 @@ from src.models.user import User
 from src.models.schedule import ScheduleSlot, RepeatType, Playlist
 from src.models.telegram import Channel
 from src.api.auth import get_current_user, require_admin
+from src.lib.responses import dumps
 
+from .cache import (
+    list_cache,
+    get_cached_calendar,
+    set_cached_calendar,
+    invalidate_calendar,
+    invalidate_active_playlist,
+)
 from .schemas import (
     ScheduleSlotCreate,
     ScheduleSlotUpdate,
     ScheduleSlotResponse,
+    slot_response_fields,
+    slot_to_response,
     CalendarViewResponse,
     BulkCopyRequest,
 )
-from .utils import parse_time, format_time, check_slot_overlap
+from .utils import (
+    parse_time,
+    format_time,
+    check_slot_overlap,
+    expand_occurrences_stmt,
+    occurrence_weekdays,
+    lock_channel_schedule,
+    load_day_intervals,
+)
 
 router = APIRouter(tags=["schedule-slots"])
 
+# Колонки слота, которые попадают в ScheduleSlotResponse
+_SLOT_RESPONSE_COLUMNS = (
+    ScheduleSlot.id,
+    ScheduleSlot.channel_id,
+    ScheduleSlot.playlist_id,
+    ScheduleSlot.start_date,
+    ScheduleSlot.start_time,
+    ScheduleSlot.end_time,
+    ScheduleSlot.repeat_type,
+    ScheduleSlot.repeat_days,
+    ScheduleSlot.repeat_until,
+    ScheduleSlot.title,
+    ScheduleSlot.description,
+    ScheduleSlot.color,
+    ScheduleSlot.is_active,
+    ScheduleSlot.priority,
+    ScheduleSlot.created_at,
+)
 
-@router.get("/slots", response_model=List[ScheduleSlotResponse])
-async def get_schedule_slots(
-    channel_id: str,
+
+@router.get("/slots", responses={200: {"model": List[ScheduleSlotResponse]}})
+def get_schedule_slots(
+    channel_uuid: uuid.UUID = Query(..., alias="channel_id", description="ID канала"),
     start_date: date = Query(..., description="Начальная дата диапазона"),
     end_date: date = Query(..., description="Конечная дата диапазона"),
     db: Session = Depends(get_db),
@@ -47,45 +89,28 @@ async def get_schedule_slots(
     
     Возвращает активные слоты, отсортированные по дате и времени.
     """
-    slots = db.query(ScheduleSlot).filter(
-        ScheduleSlot.channel_id == uuid.UUID(channel_id),
+    # Строки содержат ровно поля ответа (название плейлиста — через JOIN)
+    # и уже приведены к типам схемы, поэтому JSON собирается из словарей
+    # напрямую, без проверки через TypeAdapter или response_model
+    rows = db.query(
+        *_SLOT_RESPONSE_COLUMNS,
+        Playlist.name.label("playlist_name")
+    ).outerjoin(
+        Playlist, Playlist.id == ScheduleSlot.playlist_id
+    ).filter(
+        ScheduleSlot.channel_id == channel_uuid,
         ScheduleSlot.start_date >= start_date,
         ScheduleSlot.start_date <= end_date,
         ScheduleSlot.is_active == True
     ).order_by(ScheduleSlot.start_date, ScheduleSlot.start_time).all()
     
-    result = []
-    for slot in slots:
-        playlist_name = None
-        if slot.playlist_id:
-            playlist = db.query(Playlist).filter(Playlist.id == slot.playlist_id).first()
-            playlist_name = playlist.name if playlist else None
-        
-        result.append(ScheduleSlotResponse(
-            id=str(slot.id),
-            channel_id=str(slot.channel_id),
-            playlist_id=str(slot.playlist_id) if slot.playlist_id else None,
-            playlist_name=playlist_name,
-            start_date=slot.start_date,
-            start_time=format_time(slot.start_time),
-            end_time=format_time(slot.end_time),
-            repeat_type=slot.repeat_type,
-            repeat_days=slot.repeat_days,
-            repeat_until=slot.repeat_until,
-            title=slot.title,
-            description=slot.description,
-            color=slot.color,
-            is_active=slot.is_active,
-            priority=slot.priority,
-            created_at=slot.created_at
-        ))
-    
-    return result
+    body = dumps([slot_response_fields(row, row.playlist_name) for row in rows])
+    return Response(content=body, media_type="application/json")
 
 
-@router.get("/calendar", response_model=List[CalendarViewResponse])
-async def get_calendar_view(
-    channel_id: str,
+@router.get("/calendar", responses={200: {"model": List[CalendarViewResponse]}})
+def get_calendar_view(
+    channel_uuid: uuid.UUID = Query(..., alias="channel_id", description="ID канала"),
     year: int = Query(..., ge=2020, le=2100),
     month: int = Query(..., ge=1, le=12),
     db: Session = Depends(get_db),
@@ -102,48 +127,58 @@ async def get_calendar_view(
     start_date = date(year, month, 1)
     end_date = date(year, month, days_in_month)
     
-    slots = db.query(ScheduleSlot).filter(
-        ScheduleSlot.channel_id == uuid.UUID(channel_id),
+    cached = get_cached_calendar(channel_uuid, year, month)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Количество слотов и признак конфликта по дням считает БД: в
+    # упорядоченном по началу дне пересечение есть тогда и только тогда,
+    # когда какой-то слот начинается раньше конца предыдущего (LAG), так что
+    # приходит не больше строки на день вместо всех слотов месяца
+    prev_end = func.lag(ScheduleSlot.end_time).over(
+        partition_by=ScheduleSlot.start_date,
+        order_by=ScheduleSlot.start_time
+    )
+    day_slots = select(
+        ScheduleSlot.start_date,
+        ScheduleSlot.start_time,
+        prev_end.label("prev_end")
+    ).where(
+        ScheduleSlot.channel_id == channel_uuid,
         ScheduleSlot.start_date >= start_date,
         ScheduleSlot.start_date <= end_date,
         ScheduleSlot.is_active == True
-    ).all()
+    ).subquery()
+    stmt = select(
+        day_slots.c.start_date,
+        func.count(),
+        func.max(case((day_slots.c.start_time < day_slots.c.prev_end, 1), else_=0))
+    ).group_by(day_slots.c.start_date)
+    
+    days_data = {
+        slot_date: (slots_count, bool(conflict))
+        for slot_date, slots_count, conflict in db.execute(stmt)
+    }
     
-    # Группировка по дням
-    days_data = {}
+    # Ячейки дней — словари в порядке полей CalendarViewResponse: типы уже
+    # готовы, модель и model_dump на каждый день месяца не нужны
+    result = []
     for d in range(1, days_in_month + 1):
-        current = date(year, month, d)
-        days_data[current] = {"slots": [], "has_conflict": False}
-    
-    for slot in slots:
-        if slot.start_date in days_data:
-            days_data[slot.start_date]["slots"].append(slot)
-    
-    # Проверка конфликтов
-    for day_date, data in days_data.items():
-        day_slots = data["slots"]
-        for i, slot1 in enumerate(day_slots):
-            for slot2 in day_slots[i + 1:]:
-                # Проверяем пересечение времени
-                if not (slot1.end_time <= slot2.start_time or slot2.end_time <= slot1.start_time):
-                    data["has_conflict"] = True
-                    break
-            if data["has_conflict"]:
-                break
-    
-    return [
-        CalendarViewResponse(
-            date=day_date,
-            slots_count=len(data["slots"]),
-            has_conflicts=data["has_conflict"]
-        )
-        for day_date, data in sorted(days_data.items())
-    ]
+        day_date = date(year, month, d)
+        slots_count, has_conflicts = days_data.get(day_date, (0, False))
+        result.append({
+            "date": day_date,
+            "slots_count": slots_count,
+            "has_conflicts": has_conflicts,
+        })
+    body = dumps(result)
+    set_cached_calendar(channel_uuid, year, month, body)
+    return Response(content=body, media_type="application/json")
 
 
-@router.get("/expand", response_model=List[ScheduleSlotResponse])
-async def expand_schedule(
-    channel_id: str,
+@router.get("/expand", responses={200: {"model": List[ScheduleSlotResponse]}})
+def expand_schedule(
+    channel_uuid: uuid.UUID = Query(..., alias="channel_id", description="ID канала"),
     start_date: date = Query(...),
     end_date: date = Query(...),
     db: Session = Depends(get_db),
@@ -154,96 +189,121 @@ async def expand_schedule(
     
     Для повторяющихся слотов создает виртуальные копии на каждую дату
     в указанном диапазоне согласно правилам повторения.
+    
+    Готовый JSON кэшируется в Redis по диапазону и версии слотов канала.
+    Название плейлиста в версию не входит: переименование становится
+    видно не позже истечения TTL кэша.
     """
-    # Получаем все слоты, которые могут попасть в диапазон
-    slots = db.query(ScheduleSlot).filter(
-        ScheduleSlot.channel_id == uuid.UUID(channel_id),
-        ScheduleSlot.is_active == True,
-        or_(
-            # Одноразовые слоты в диапазоне
-            and_(
-                ScheduleSlot.repeat_type == RepeatType.NONE,
-                ScheduleSlot.start_date >= start_date,
-                ScheduleSlot.start_date <= end_date
-            ),
-            # Повторяющиеся слоты, начавшиеся до конца диапазона
-            and_(
-                ScheduleSlot.repeat_type != RepeatType.NONE,
-                ScheduleSlot.start_date <= end_date
+    # Версия слотов канала: в диапазон могут попасть повторения слотов,
+    # начавшихся задолго до start_date, поэтому считается по всему каналу
+    version = tuple(db.query(
+        func.count(ScheduleSlot.id),
+        func.max(ScheduleSlot.created_at),
+        func.max(ScheduleSlot.updated_at)
+    ).filter(ScheduleSlot.channel_id == channel_uuid).one())
+    cached = list_cache.get_expanded(channel_uuid, start_date, end_date, version)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Список (строка слота, даты вхождений). Слоты только читаются, поэтому
+    # выбираются колонки ответа, без ORM-объектов и identity map; название
+    # плейлиста приходит тем же запросом через LEFT JOIN
+    slot_occurrences = []
+    columns = (*_SLOT_RESPONSE_COLUMNS, Playlist.name.label("playlist_name"))
+    with_playlist = (Playlist, Playlist.id == ScheduleSlot.playlist_id)
+    
+    if db.get_bind().dialect.name == "postgresql":
+        # PostgreSQL разворачивает повторения сам (generate_series):
+        # приходят только нужные строки, без перебора дней в Python
+        by_slot = {}
+        for row in db.execute(
+            expand_occurrences_stmt(
+                channel_uuid, start_date, end_date, *columns
+            ).outerjoin_from(ScheduleSlot, *with_playlist)
+        ):
+            if row.id not in by_slot:
+                by_slot[row.id] = (row, [])
+                slot_occurrences.append(by_slot[row.id])
+            by_slot[row.id][1].append(row.occ_date)
+    else:
+        # Получаем все слоты, которые могут попасть в диапазон
+        slots = db.execute(select(*columns).outerjoin(*with_playlist).where(
+            ScheduleSlot.channel_id == channel_uuid,
+            ScheduleSlot.is_active == True,
+            or_(
+                # Одноразовые слоты в диапазоне
+                and_(
+                    ScheduleSlot.repeat_type == RepeatType.NONE,
+                    ScheduleSlot.start_date >= start_date,
+                    ScheduleSlot.start_date <= end_date
+                ),
+                # Повторяющиеся слоты, начавшиеся до конца диапазона
+                and_(
+                    ScheduleSlot.repeat_type != RepeatType.NONE,
+                    ScheduleSlot.start_date <= end_date
+                )
             )
-        )
-    ).all()
-    
+        )).all()
+        # Даты диапазона строятся один раз; вхождения слота — срез этого
+        # списка, без арифметики дат на каждый слот
+        range_days = [
+            start_date + timedelta(days=i)
+            for i in range((end_date - start_date).days + 1)
+        ]
+        for slot in slots:
+            if slot.repeat_type == RepeatType.NONE:
+                # Одноразовый слот
+                if not (start_date <= slot.start_date <= end_date):
+                    continue
+                occurrences = [slot.start_date]
+            else:
+                # Повторяющийся слот: дни от начала слота (не раньше
+                # start_date) до repeat_until (не позже end_date),
+                # подходящие по дню недели
+                start_occ = max(slot.start_date, start_date)
+                last_occ = slot.repeat_until if slot.repeat_until else end_date
+                last_occ = min(last_occ, end_date)
+                if last_occ < start_occ:
+                    continue
+                days = range_days[
+                    (start_occ - start_date).days:(last_occ - start_date).days + 1
+                ]
+                weekdays = occurrence_weekdays(slot)
+                if weekdays is None:
+                    occurrences = days
+                else:
+                    occurrences = [day for day in days if day.weekday() in weekdays]
+            slot_occurrences.append((slot, occurrences))
+    
+    # Данные из БД уже приведены к типам ScheduleSlotResponse, поэтому
+    # вхождения собираются словарями в порядке полей схемы: без создания
+    # модели и model_dump на каждое вхождение повторяющегося слота.
+    # UUID не приводятся к str заранее — orjson пишет их сам
     result = []
     
-    for slot in slots:
-        if slot.repeat_type == RepeatType.NONE:
-            # Одноразовый слот
-            if start_date <= slot.start_date <= end_date:
-                result.append(ScheduleSlotResponse(
-                    id=str(slot.id),
-                    channel_id=str(slot.channel_id),
-                    playlist_id=str(slot.playlist_id) if slot.playlist_id else None,
-                    playlist_name=(db.query(Playlist).filter(Playlist.id == slot.playlist_id).first().name
-                                   if slot.playlist_id else None),
-                    start_date=slot.start_date,
-                    start_time=format_time(slot.start_time),
-                    end_time=format_time(slot.end_time),
-                    repeat_type=slot.repeat_type,
-                    repeat_days=slot.repeat_days,
-                    repeat_until=slot.repeat_until,
-                    title=slot.title,
-                    description=slot.description,
-                    color=slot.color,
-                    is_active=slot.is_active,
-                    priority=slot.priority,
-                    created_at=slot.created_at
-                ))
-        elif slot.repeat_type == RepeatType.DAILY:
-            # Ежедневное повторение
-            start_occ = max(slot.start_date, start_date)
-            last_occ = slot.repeat_until if slot.repeat_until else end_date
-            last_occ = min(last_occ, end_date)
-            current = start_occ
-            while current <= last_occ:
-                result.append(ScheduleSlotResponse(
-                    id=str(slot.id),
-                    channel_id=str(slot.channel_id),
-                    playlist_id=str(slot.playlist_id) if slot.playlist_id else None,
-                    playlist_name=(db.query(Playlist).filter(Playlist.id == slot.playlist_id).first().name
-                                   if slot.playlist_id else None),
-                    start_date=current,
-                    start_time=format_time(slot.start_time),
-                    end_time=format_time(slot.end_time),
-                    repeat_type=slot.repeat_type,
-                    repeat_days=slot.repeat_days,
-                    repeat_until=slot.repeat_until,
-                    title=slot.title,
-                    description=slot.description,
-                    color=slot.color,
-                    is_active=slot.is_active,
-                    priority=slot.priority,
-                    created_at=slot.created_at
-                ))
-                current = current + timedelta(days=1)
-        else:
-            # Другие типы повторения (weekly/custom) - пропускаем пока
-            continue
+    for slot, occurrences in slot_occurrences:
+        # Поля, общие для всех вхождений слота, вычисляем один раз
+        fields = slot_response_fields(slot, slot.playlist_name)
+        result.extend(dict(fields, start_date=occ) for occ in occurrences)
 
     # Сортировка по дате/времени
-    result.sort(key=lambda r: (r.start_date, r.start_time))
-    return result
+    result.sort(key=itemgetter("start_date", "start_time"))
+    body = dumps(result)
+    list_cache.set_expanded(channel_uuid, start_date, end_date, version, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/slots", response_model=ScheduleSlotResponse, status_code=201)
-async def create_schedule_slot(
+def create_schedule_slot(
     slot_data: ScheduleSlotCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """Создать новый слот расписания."""
     # Проверка канала
-    channel = db.query(Channel).filter(Channel.id == uuid.UUID(slot_data.channel_id)).first()
+    channel_uuid = slot_data.channel_id
+    # Нужен только факт существования: читаем ключ, а не строку канала
+    channel = db.query(Channel.id).filter(Channel.id == channel_uuid).first()
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     
@@ -256,66 +316,56 @@ async def create_schedule_slot(
         raise HTTPException(status_code=400, detail="End time must be after start time")
     
     # Проверка пересечений
-    if check_slot_overlap(db, slot_data.channel_id, slot_data.start_date, start_t, end_t):
+    if check_slot_overlap(db, channel_uuid, slot_data.start_date, start_t, end_t):
         raise HTTPException(status_code=409, detail="Time slot overlaps with existing schedule")
     
-    # Проверка плейлиста
+    # Проверка плейлиста: нужно только название, items не читаем
     playlist_name = None
     if slot_data.playlist_id:
-        playlist = db.query(Playlist).filter(Playlist.id == uuid.UUID(slot_data.playlist_id)).first()
-        if not playlist:
+        playlist_name = db.query(Playlist.name).filter(
+            Playlist.id == slot_data.playlist_id
+        ).scalar()
+        if playlist_name is None:
             raise HTTPException(status_code=404, detail="Playlist not found")
-        playlist_name = playlist.name
-    
-    slot = ScheduleSlot(
-        channel_id=uuid.UUID(slot_data.channel_id),
-        playlist_id=uuid.UUID(slot_data.playlist_id) if slot_data.playlist_id else None,
-        start_date=slot_data.start_date,
-        start_time=start_t,
-        end_time=end_t,
-        repeat_type=slot_data.repeat_type,
-        repeat_days=slot_data.repeat_days,
-        repeat_until=slot_data.repeat_until,
-        title=slot_data.title,
-        description=slot_data.description,
-        color=slot_data.color,
-        priority=slot_data.priority,
-        created_by=current_user.id
-    )
     
-    db.add(slot)
+    # INSERT ... RETURNING: значения по умолчанию (id, created_at) приходят
+    # тем же запросом, без refresh после commit
+    slot = db.execute(
+        insert(ScheduleSlot).values(
+            channel_id=channel_uuid,
+            playlist_id=slot_data.playlist_id,
+            start_date=slot_data.start_date,
+            start_time=start_t,
+            end_time=end_t,
+            repeat_type=slot_data.repeat_type,
+            repeat_days=slot_data.repeat_days,
+            repeat_until=slot_data.repeat_until,
+            title=slot_data.title,
+            description=slot_data.description,
+            color=slot_data.color,
+            priority=slot_data.priority,
+            created_by=current_user.id
+        ).returning(ScheduleSlot)
+    ).scalar_one()
+    # Ответ собирается до commit, пока атрибуты не сброшены сессией
+    response = slot_to_response(slot, playlist_name)
+    
     db.commit()
-    db.refresh(slot)
+    invalidate_calendar(channel_uuid)
+    invalidate_active_playlist(channel_uuid)
     
-    return ScheduleSlotResponse(
-        id=str(slot.id),
-        channel_id=str(slot.channel_id),
-        playlist_id=str(slot.playlist_id) if slot.playlist_id else None,
-        playlist_name=playlist_name,
-        start_date=slot.start_date,
-        start_time=format_time(slot.start_time),
-        end_time=format_time(slot.end_time),
-        repeat_type=slot.repeat_type,
-        repeat_days=slot.repeat_days,
-        repeat_until=slot.repeat_until,
-        title=slot.title,
-        description=slot.description,
-        color=slot.color,
-        is_active=slot.is_active,
-        priority=slot.priority,
-        created_at=slot.created_at
-    )
+    return response
 
 
 @router.put("/slots/{slot_id}", response_model=ScheduleSlotResponse)
-async def update_schedule_slot(
-    slot_id: str,
+def update_schedule_slot(
+    slot_id: uuid.UUID,
     slot_data: ScheduleSlotUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """Обновить слот расписания."""
-    slot = db.query(ScheduleSlot).filter(ScheduleSlot.id == uuid.UUID(slot_id)).first()
+    slot = db.query(ScheduleSlot).filter(ScheduleSlot.id == slot_id).first()
     if not slot:
         raise HTTPException(status_code=404, detail="Schedule slot not found")
     
@@ -326,15 +376,13 @@ async def update_schedule_slot(
         update_data["start_time"] = parse_time(update_data["start_time"])
     if "end_time" in update_data:
         update_data["end_time"] = parse_time(update_data["end_time"])
-    if "playlist_id" in update_data and update_data["playlist_id"]:
-        update_data["playlist_id"] = uuid.UUID(update_data["playlist_id"])
     
     # Проверка пересечений при изменении времени
     new_start = update_data.get("start_time", slot.start_time)
     new_end = update_data.get("end_time", slot.end_time)
     new_date = update_data.get("start_date", slot.start_date)
     
-    if check_slot_overlap(db, str(slot.channel_id), new_date, new_start, new_end, exclude_id=slot_id):
+    if check_slot_overlap(db, slot.channel_id, new_date, new_start, new_end, exclude_id=slot.id):
         raise HTTPException(status_code=409, detail="Time slot overlaps with existing schedule")
     
     for key, value in update_data.items():
@@ -342,51 +390,42 @@ async def update_schedule_slot(
     
     db.commit()
     db.refresh(slot)
+    invalidate_calendar(slot.channel_id)
+    invalidate_active_playlist(slot.channel_id)
     
     playlist_name = None
     if slot.playlist_id:
-        playlist = db.query(Playlist).filter(Playlist.id == slot.playlist_id).first()
-        playlist_name = playlist.name if playlist else None
-    
-    return ScheduleSlotResponse(
-        id=str(slot.id),
-        channel_id=str(slot.channel_id),
-        playlist_id=str(slot.playlist_id) if slot.playlist_id else None,
-        playlist_name=playlist_name,
-        start_date=slot.start_date,
-        start_time=format_time(slot.start_time),
-        end_time=format_time(slot.end_time),
-        repeat_type=slot.repeat_type,
-        repeat_days=slot.repeat_days,
-        repeat_until=slot.repeat_until,
-        title=slot.title,
-        description=slot.description,
-        color=slot.color,
-        is_active=slot.is_active,
-        priority=slot.priority,
-        created_at=slot.created_at
-    )
+        playlist_name = db.query(Playlist.name).filter(
+            Playlist.id == slot.playlist_id
+        ).scalar()
+    
+    return slot_to_response(slot, playlist_name)
 
 
 @router.delete("/slots/{slot_id}", status_code=204)
-async def delete_schedule_slot(
-    slot_id: str,
+def delete_schedule_slot(
+    slot_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """Удалить слот расписания."""
-    slot = db.query(ScheduleSlot).filter(ScheduleSlot.id == uuid.UUID(slot_id)).first()
-    if not slot:
+    # DELETE ... RETURNING: удаление и канал для сброса кэшей — одним
+    # запросом, без загрузки слота
+    channel_id = db.execute(
+        delete(ScheduleSlot).where(ScheduleSlot.id == slot_id).returning(ScheduleSlot.channel_id)
+    ).scalar_one_or_none()
+    if channel_id is None:
         raise HTTPException(status_code=404, detail="Schedule slot not found")
     
-    db.delete(slot)
     db.commit()
+    invalidate_calendar(channel_id)
+    invalidate_active_playlist(channel_id)
     
     return Response(status_code=204)
 
 
 @router.post("/copy")
-async def copy_schedule(
+def copy_schedule(
     request: BulkCopyRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -397,9 +436,11 @@ async def copy_schedule(
     Создает копии всех слотов источника на указанные целевые даты.
     Пропускает слоты, которые конфликтуют с существующими.
     """
+    channel_uuid = request.channel_id
+    
     # Получаем слоты источника
     source_slots = db.query(ScheduleSlot).filter(
-        ScheduleSlot.channel_id == uuid.UUID(request.channel_id),
+        ScheduleSlot.channel_id == channel_uuid,
         ScheduleSlot.start_date == request.source_date,
         ScheduleSlot.is_active == True
     ).all()
@@ -416,35 +457,39 @@ async def copy_schedule(
     created_count = 0
     skipped_count = 0
     created_slots = []
+    new_rows = []
     
-    for target_date in request.target_dates:
-        if target_date == request.source_date:
-            continue
-            
+    # Как и в apply_template: проверка пересечений и вставка — под
+    # блокировкой канала
+    lock_channel_schedule(db, channel_uuid)
+    
+    # Занятые интервалы всех целевых дат — одним запросом (день-источник
+    # пропускается, его слоты не нужны)
+    target_dates = [d for d in request.target_dates if d != request.source_date]
+    busy = load_day_intervals(db, channel_uuid, target_dates)
+    
+    for target_date in target_dates:
+        day_busy = busy[target_date]
         for source_slot in source_slots:
             # Проверяем пересечения
-            if check_slot_overlap(
-                db, request.channel_id, target_date, 
-                source_slot.start_time, source_slot.end_time
-            ):
+            if day_busy.overlaps(source_slot.start_time, source_slot.end_time):
                 skipped_count += 1
                 continue
+            day_busy.add(source_slot.start_time, source_slot.end_time)
             
-            new_slot = ScheduleSlot(
-                channel_id=source_slot.channel_id,
-                playlist_id=source_slot.playlist_id,
-                start_date=target_date,
-                start_time=source_slot.start_time,
-                end_time=source_slot.end_time,
-                repeat_type=RepeatType.NONE,  # Копии не повторяются
-                title=source_slot.title,
-                description=source_slot.description,
-                color=source_slot.color,
-                priority=source_slot.priority,
-                created_by=current_user.id
-            )
-            
-            db.add(new_slot)
+            new_rows.append({
+                "channel_id": source_slot.channel_id,
+                "playlist_id": source_slot.playlist_id,
+                "start_date": target_date,
+                "start_time": source_slot.start_time,
+                "end_time": source_slot.end_time,
+                "repeat_type": RepeatType.NONE,  # Копии не повторяются
+                "title": source_slot.title,
+                "description": source_slot.description,
+                "color": source_slot.color,
+                "priority": source_slot.priority,
+                "created_by": current_user.id
+            })
             created_count += 1
             created_slots.append({
                 "date": str(target_date),
@@ -452,7 +497,12 @@ async def copy_schedule(
                 "end_time": format_time(source_slot.end_time)
             })
     
+    # Все копии вставляются одним пакетным INSERT
+    if new_rows:
+        db.execute(insert(ScheduleSlot), new_rows)
     db.commit()
+    invalidate_calendar(channel_uuid)
+    invalidate_active_playlist(channel_uuid)
     
     return {
         "message": f"Copied {created_count} slots, skipped {skipped_count} due to conflicts",
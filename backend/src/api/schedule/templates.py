@@ -4,12 +4,17 @@
 Включает:
 - CRUD операции для ScheduleTemplate
 - Применение шаблонов на выбранные даты
+
+Обработчики — обычные def и выполняются в пуле потоков FastAPI, так как
+работают с синхронной сессией SQLAlchemy.
 """
 import uuid
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import or_
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, or_
 from sqlalchemy.orm import Session
 
 from src.database import get_db
@@ -17,24 +22,42 @@ from src.models.user import User
 from src.models.schedule import ScheduleSlot, ScheduleTemplate, RepeatType
 from src.api.auth import get_current_user
 
+from .cache import invalidate_calendar, invalidate_active_playlist
 from .schemas import (
     ScheduleTemplateCreate,
     ScheduleTemplateResponse,
     ApplyTemplateRequest,
 )
-from .utils import parse_time, check_slot_overlap
+from .utils import parse_time, parse_uuid, lock_channel_schedule, load_day_intervals
 
 router = APIRouter(tags=["schedule-templates"])
 
+# Список шаблонов (свои и публичные всех пользователей) валидируется
+# и сериализуется в JSON pydantic-core за один проход, без повторной
+# проверки через response_model
+_TEMPLATE_LIST = TypeAdapter(List[ScheduleTemplateResponse])
+
+# Колонки шаблона, которые попадают в ScheduleTemplateResponse
+_TEMPLATE_RESPONSE_COLUMNS = (
+    ScheduleTemplate.id,
+    ScheduleTemplate.name,
+    ScheduleTemplate.description,
+    ScheduleTemplate.channel_id,
+    ScheduleTemplate.slots,
+    ScheduleTemplate.is_public,
+    ScheduleTemplate.created_at,
+)
 
-@router.get("/templates", response_model=List[ScheduleTemplateResponse])
-async def get_templates(
-    channel_id: Optional[str] = None,
+
+@router.get("/templates", responses={200: {"model": List[ScheduleTemplateResponse]}})
+def get_templates(
+    channel_id: Optional[uuid.UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Получить список шаблонов расписания."""
-    query = db.query(ScheduleTemplate).filter(
+    # Шаблоны только читаются: выбираются колонки ответа, без ORM-объектов
+    query = db.query(*_TEMPLATE_RESPONSE_COLUMNS).filter(
         or_(
             ScheduleTemplate.user_id == current_user.id,
             ScheduleTemplate.is_public == True
@@ -44,60 +67,45 @@ async def get_templates(
     if channel_id:
         query = query.filter(
             or_(
-                ScheduleTemplate.channel_id == uuid.UUID(channel_id),
+                ScheduleTemplate.channel_id == channel_id,
                 ScheduleTemplate.channel_id == None
             )
         )
     
-    templates = query.order_by(ScheduleTemplate.created_at.desc()).all()
-    
-    return [
-        ScheduleTemplateResponse(
-            id=str(t.id),
-            name=t.name,
-            description=t.description,
-            channel_id=str(t.channel_id) if t.channel_id else None,
-            slots=t.slots,
-            is_public=t.is_public,
-            created_at=t.created_at
-        )
-        for t in templates
-    ]
+    rows = query.order_by(ScheduleTemplate.created_at.desc()).all()
+    
+    body = _TEMPLATE_LIST.dump_json(_TEMPLATE_LIST.validate_python(rows))
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/templates", response_model=ScheduleTemplateResponse, status_code=201)
-async def create_template(
+def create_template(
     template_data: ScheduleTemplateCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Создать шаблон расписания."""
-    template = ScheduleTemplate(
-        user_id=current_user.id,
-        channel_id=uuid.UUID(template_data.channel_id) if template_data.channel_id else None,
-        name=template_data.name,
-        description=template_data.description,
-        slots=[s.model_dump() for s in template_data.slots],
-        is_public=template_data.is_public
-    )
+    # INSERT ... RETURNING вместо add + commit + refresh
+    template = db.execute(
+        insert(ScheduleTemplate).values(
+            user_id=current_user.id,
+            channel_id=template_data.channel_id,
+            name=template_data.name,
+            description=template_data.description,
+            slots=[s.model_dump() for s in template_data.slots],
+            is_public=template_data.is_public
+        ).returning(ScheduleTemplate)
+    ).scalar_one()
+    # Ответ собирается до commit, пока атрибуты не сброшены сессией
+    response = ScheduleTemplateResponse.model_validate(template)
     
-    db.add(template)
     db.commit()
-    db.refresh(template)
-    
-    return ScheduleTemplateResponse(
-        id=str(template.id),
-        name=template.name,
-        description=template.description,
-        channel_id=str(template.channel_id) if template.channel_id else None,
-        slots=template.slots,
-        is_public=template.is_public,
-        created_at=template.created_at
-    )
+    
+    return response
 
 
 @router.post("/templates/apply")
-async def apply_template(
+def apply_template(
     request: ApplyTemplateRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -108,7 +116,7 @@ async def apply_template(
     Создает слоты из шаблона для каждой указанной даты.
     """
     template = db.query(ScheduleTemplate).filter(
-        ScheduleTemplate.id == uuid.UUID(request.template_id)
+        ScheduleTemplate.id == request.template_id
     ).first()
     
     if not template:
@@ -118,36 +126,56 @@ async def apply_template(
     if template.user_id != current_user.id and not template.is_public:
         raise HTTPException(status_code=403, detail="Access denied to this template")
     
+    channel_uuid = request.channel_id
     created_count = 0
     skipped_count = 0
+    new_rows = []
+    
+    # Время слотов шаблона разбираем один раз, а не для каждой даты
+    template_slots = []
+    for slot_data in template.slots:
+        playlist_id = slot_data.get("playlist_id")
+        template_slots.append((
+            parse_time(slot_data["start_time"]),
+            parse_time(slot_data["end_time"]),
+            parse_uuid(playlist_id, "Invalid playlist id in template") if playlist_id else None,
+            slot_data
+        ))
+    
+    # Проверка пересечений и вставка идут под блокировкой канала, чтобы
+    # параллельные применения шаблонов не создали пересекающиеся слоты
+    lock_channel_schedule(db, channel_uuid)
+    
+    # Занятые интервалы всех целевых дат — одним запросом
+    busy = load_day_intervals(db, channel_uuid, request.target_dates)
     
     for target_date in request.target_dates:
-        for slot_data in template.slots:
-            start_t = parse_time(slot_data["start_time"])
-            end_t = parse_time(slot_data["end_time"])
-            
+        day_busy = busy[target_date]
+        for start_t, end_t, playlist_uuid, slot_data in template_slots:
             # Проверяем пересечения
-            if check_slot_overlap(db, request.channel_id, target_date, start_t, end_t):
+            if day_busy.overlaps(start_t, end_t):
                 skipped_count += 1
                 continue
+            day_busy.add(start_t, end_t)
             
-            playlist_id = slot_data.get("playlist_id")
-            
-            new_slot = ScheduleSlot(
-                channel_id=uuid.UUID(request.channel_id),
-                playlist_id=uuid.UUID(playlist_id) if playlist_id else None,
-                start_date=target_date,
-                start_time=start_t,
-                end_time=end_t,
-                title=slot_data.get("title"),
-                color=slot_data.get("color", "#3B82F6"),
-                created_by=current_user.id
-            )
-            
-            db.add(new_slot)
+            new_rows.append({
+                "channel_id": channel_uuid,
+                "playlist_id": playlist_uuid,
+                "start_date": target_date,
+                "start_time": start_t,
+                "end_time": end_t,
+                "title": slot_data.get("title"),
+                "color": slot_data.get("color", "#3B82F6"),
+                "created_by": current_user.id
+            })
             created_count += 1
     
+    # Все слоты вставляются одним пакетным INSERT
+    if new_rows:
+        db.execute(insert(ScheduleSlot), new_rows)
     db.commit()
+    invalidate_calendar(channel_uuid)
+    invalidate_active_playlist(channel_uuid)
     
     return {
         "message": f"Applied template: created {created_count} slots, skipped {skipped_count}",
@@ -157,21 +185,23 @@ async def apply_template(
 
 
 @router.delete("/templates/{template_id}")
-async def delete_template(
-    template_id: str,
+def delete_template(
+    template_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Удалить шаблон расписания."""
-    template = db.query(ScheduleTemplate).filter(
-        ScheduleTemplate.id == uuid.UUID(template_id),
-        ScheduleTemplate.user_id == current_user.id
-    ).first()
+    # Проверка владельца и удаление — один DELETE, без загрузки слотов шаблона
+    deleted = db.execute(
+        delete(ScheduleTemplate).where(
+            ScheduleTemplate.id == template_id,
+            ScheduleTemplate.user_id == current_user.id
+        ).returning(ScheduleTemplate.id)
+    ).scalar_one_or_none()
     
-    if not template:
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Template not found or access denied")
     
-    db.delete(template)
     db.commit()
     
     return {"message": "Template deleted", "id": template_id}
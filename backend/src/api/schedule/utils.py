@@ -3,20 +3,29 @@ Utility functions для Schedule API.
 """
 
 import uuid
-from datetime import time
-from typing import Optional
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from datetime import date, datetime, time, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import Date, Integer, and_, bindparam, case, cast, extract, func, literal_column, or_, select, true
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import Select
 
-from src.models.schedule import ScheduleSlot
+from src.models.schedule import ScheduleSlot, Playlist, RepeatType
 
 
+@lru_cache(maxsize=1024)
 def parse_time(time_str: str) -> time:
     """
     Парсинг времени из строки HH:MM.
     
+    Результат мемоизируется: в расписании повторяется небольшой набор
+    времён (шаблоны применяются на многие даты).
+    
     Args:
         time_str: Время в формате "HH:MM"
         
@@ -36,26 +45,95 @@ def parse_time(time_str: str) -> time:
         )
 
 
+@lru_cache(maxsize=4096)
+def _uuid(value: str) -> uuid.UUID:
+    """Разбор UUID с мемоизацией: набор каналов и плейлистов стабилен."""
+    return uuid.UUID(value)
+
+
+def parse_uuid(value: str, detail: str = "Invalid id") -> uuid.UUID:
+    """
+    Парсинг UUID из строки.
+    
+    Повторяющиеся значения (ID плейлистов в слотах шаблонов) разбираются
+    один раз и дальше берутся из LRU-кэша.
+    
+    Args:
+        value: UUID в строковом виде
+        detail: Текст ошибки для клиента
+        
+    Returns:
+        UUID
+        
+    Raises:
+        HTTPException: Если строка не является UUID
+    """
+    try:
+        return _uuid(value)
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def now_utc() -> datetime:
+    """
+    Зависимость FastAPI: текущее время в UTC.
+    
+    Обработчик получает момент запроса параметром и остаётся чистой
+    логикой запроса; в тестах время подменяется через dependency_overrides.
+    
+    Returns:
+        datetime с tzinfo=UTC
+    """
+    return datetime.now(timezone.utc)
+
+
+# Все 1440 строк "HH:MM" суток: форматирование — индекс в списке, без
+# strftime и без хэширования time в кэше
+_HHMM = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+
+
 def format_time(t: time) -> str:
     """
     Форматирование времени в строку HH:MM.
     
+    Вызывается для каждого слота ответа, поэтому строка берётся из
+    заранее построенной таблицы.
+    
     Args:
         t: datetime.time объект
         
     Returns:
         Строка в формате "HH:MM"
     """
-    return t.strftime("%H:%M")
+    return _HHMM[t.hour * 60 + t.minute]
+
+
+# Проверка пересечений собрана один раз при импорте: значения передаются
+# bind-параметрами, и скомпилированный SQL берётся из кэша движка, в том
+# числе при вызовах в циклах. Интервалы [start, end) пересекаются, если
+# каждый начинается раньше конца другого. EXISTS: БД останавливается на
+# первом совпадении и возвращает один bool
+_SLOT_OVERLAP_CRITERIA = (
+    ScheduleSlot.channel_id == bindparam("channel_id"),
+    ScheduleSlot.start_date == bindparam("start_date"),
+    ScheduleSlot.is_active == True,
+    ScheduleSlot.start_time < bindparam("end_time"),
+    ScheduleSlot.end_time > bindparam("start_time"),
+)
+_SLOT_OVERLAP = select(select(ScheduleSlot.id).where(*_SLOT_OVERLAP_CRITERIA).exists())
+_SLOT_OVERLAP_EXCLUDING = select(select(ScheduleSlot.id).where(
+    *_SLOT_OVERLAP_CRITERIA,
+    ScheduleSlot.id != bindparam("exclude_id")
+).exists())
 
 
 def check_slot_overlap(
     db: Session, 
-    channel_id: str, 
+    channel_id: uuid.UUID, 
     start_date, 
     start_time: time, 
     end_time: time,
-    exclude_id: Optional[str] = None
+    exclude_id: Optional[uuid.UUID] = None
 ) -> bool:
     """
     Проверка пересечения слотов.
@@ -74,28 +152,226 @@ def check_slot_overlap(
     Returns:
         True если есть пересечение, False иначе
     """
-    query = db.query(ScheduleSlot).filter(
-        ScheduleSlot.channel_id == uuid.UUID(channel_id),
-        ScheduleSlot.start_date == start_date,
+    params = {
+        "channel_id": channel_id,
+        "start_date": start_date,
+        "start_time": start_time,
+        "end_time": end_time,
+    }
+    if exclude_id:
+        params["exclude_id"] = exclude_id
+        return bool(db.execute(_SLOT_OVERLAP_EXCLUDING, params).scalar())
+    return bool(db.execute(_SLOT_OVERLAP, params).scalar())
+
+
+def get_playlist_names(db: Session, slots: Iterable[ScheduleSlot]) -> Dict[uuid.UUID, str]:
+    """
+    Получение названий плейлистов для набора слотов одним запросом.
+    
+    Args:
+        db: Сессия базы данных
+        slots: Слоты расписания
+        
+    Returns:
+        Словарь {playlist_id: name} для найденных плейлистов
+    """
+    playlist_ids = {slot.playlist_id for slot in slots if slot.playlist_id}
+    if not playlist_ids:
+        return {}
+    rows = db.query(Playlist.id, Playlist.name).filter(Playlist.id.in_(playlist_ids)).all()
+    return {row.id: row.name for row in rows}
+
+
+class BusyIntervals:
+    """
+    Занятые интервалы одного дня для массовой проверки пересечений.
+    
+    Интервалы хранятся объединёнными и отсортированными, поэтому проверка
+    и добавление выполняются бинарным поиском за O(log n). Условие
+    пересечения совпадает с check_slot_overlap для корректных слотов
+    (start < end).
+    """
+    
+    def __init__(self):
+        self._starts: List[time] = []
+        self._ends: List[time] = []
+    
+    def overlaps(self, start_time: time, end_time: time) -> bool:
+        """
+        Проверка пересечения интервала с занятыми.
+        
+        Args:
+            start_time: Время начала
+            end_time: Время окончания
+            
+        Returns:
+            True если есть пересечение, False иначе
+        """
+        i = bisect_right(self._ends, start_time)
+        return i < len(self._starts) and self._starts[i] < end_time
+    
+    def add(self, start_time: time, end_time: time) -> None:
+        """
+        Добавление занятого интервала с объединением пересекающихся.
+        
+        Args:
+            start_time: Время начала
+            end_time: Время окончания
+        """
+        lo = bisect_left(self._ends, start_time)
+        hi = bisect_right(self._starts, end_time)
+        if lo < hi:
+            start_time = min(start_time, self._starts[lo])
+            end_time = max(end_time, self._ends[hi - 1])
+        self._starts[lo:hi] = [start_time]
+        self._ends[lo:hi] = [end_time]
+
+
+def lock_channel_schedule(db: Session, channel_id: uuid.UUID) -> None:
+    """
+    Блокировка расписания канала до конца текущей транзакции.
+    
+    Массовое создание слотов (шаблоны, копирование) читает занятые
+    интервалы и вставляет новые слоты не атомарно. Транзакционная
+    advisory-блокировка по каналу сериализует такие операции: параллельный
+    запрос ждёт commit первого и видит уже созданные им слоты. На других
+    СУБД (SQLite в тестах) ничего не делает.
+    
+    Args:
+        db: Сессия базы данных
+        channel_id: ID канала
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(str(channel_id)))))
+
+
+def load_day_intervals(
+    db: Session,
+    channel_id: uuid.UUID,
+    dates: Iterable[date]
+) -> Dict[date, BusyIntervals]:
+    """
+    Загрузка занятых интервалов канала на набор дат одним запросом.
+    
+    Используется массовыми операциями (копирование, применение шаблона)
+    вместо вызова check_slot_overlap на каждую пару (дата, слот).
+    
+    Args:
+        db: Сессия базы данных
+        channel_id: ID канала
+        dates: Даты, для которых нужны интервалы
+        
+    Returns:
+        Словарь {дата: BusyIntervals} активных слотов; для дат без слотов
+        создаётся пустой набор
+    """
+    intervals: Dict[date, BusyIntervals] = defaultdict(BusyIntervals)
+    dates = set(dates)
+    if not dates:
+        return intervals
+    rows = db.query(
+        ScheduleSlot.start_date, ScheduleSlot.start_time, ScheduleSlot.end_time
+    ).filter(
+        ScheduleSlot.channel_id == channel_id,
+        ScheduleSlot.start_date.in_(dates),
+        ScheduleSlot.is_active == True
+    ).all()
+    for row in rows:
+        intervals[row.start_date].add(row.start_time, row.end_time)
+    return intervals
+
+
+_WEEKDAYS = frozenset(range(5))
+_WEEKENDS = frozenset((5, 6))
+
+
+def occurrence_weekdays(slot: ScheduleSlot) -> Optional[FrozenSet[int]]:
+    """
+    Дни недели, в которые повторяется слот.
+    
+    Args:
+        slot: Повторяющийся слот (repeat_type не NONE)
+        
+    Returns:
+        Множество date.weekday() (0=понедельник) или None, если слот
+        повторяется каждый день
+    """
+    if slot.repeat_type == RepeatType.WEEKLY:
+        return frozenset((slot.start_date.weekday(),))
+    if slot.repeat_type == RepeatType.WEEKDAYS:
+        return _WEEKDAYS
+    if slot.repeat_type == RepeatType.WEEKENDS:
+        return _WEEKENDS
+    if slot.repeat_type == RepeatType.CUSTOM:
+        return frozenset(slot.repeat_days or ())
+    return None
+
+
+def expand_occurrences_stmt(
+    channel_id: uuid.UUID,
+    start_date: date,
+    end_date: date,
+    *columns
+) -> Select:
+    """
+    Запрос, разворачивающий слоты в вхождения на стороне PostgreSQL.
+    
+    LATERAL generate_series перебирает дни между началом слота (не раньше
+    start_date) и repeat_until (не позже end_date; одноразовый слот — только
+    свою дату, и слоты до start_date отсекаются сразу); фильтр оставляет дни,
+    подходящие под правило повторения (день недели — по ISODOW, так что
+    ISODOW - 1 совпадает с нумерацией repeat_days, 0=понедельник).
+    
+    Только для PostgreSQL (generate_series с interval).
+    
+    Args:
+        channel_id: ID канала
+        start_date: Начало диапазона
+        end_date: Конец диапазона
+        *columns: Колонки слота для выборки (по умолчанию — ScheduleSlot целиком)
+        
+    Returns:
+        SELECT, возвращающий колонки (или ScheduleSlot) и дату вхождения occ_date
+    """
+    # Для одноразового слота ряд кончается на его же дате: прошлые
+    # одноразовые слоты не разворачиваются в дни всего диапазона
+    series_end = func.coalesce(
+        ScheduleSlot.repeat_until,
+        case((ScheduleSlot.repeat_type == RepeatType.NONE, ScheduleSlot.start_date), else_=end_date)
+    )
+    days = func.generate_series(
+        func.greatest(ScheduleSlot.start_date, start_date),
+        func.least(series_end, end_date),
+        literal_column("interval '1 day'")
+    ).table_valued("value").lateral("occ")
+    occ_date = cast(days.c.value, Date)
+    occ_isodow = extract("isodow", days.c.value)
+    return select(
+        *(columns or (ScheduleSlot,)), occ_date.label("occ_date")
+    ).select_from(ScheduleSlot).join(days, true()).where(
+        ScheduleSlot.channel_id == channel_id,
         ScheduleSlot.is_active == True,
+        ScheduleSlot.start_date <= end_date,
+        or_(ScheduleSlot.repeat_type != RepeatType.NONE, ScheduleSlot.start_date >= start_date),
         or_(
-            # Новый слот начинается внутри существующего
             and_(
-                ScheduleSlot.start_time <= start_time,
-                ScheduleSlot.end_time > start_time
+                ScheduleSlot.repeat_type == RepeatType.NONE,
+                ScheduleSlot.start_date == occ_date
             ),
-            # Новый слот заканчивается внутри существующего
+            ScheduleSlot.repeat_type == RepeatType.DAILY,
             and_(
-                ScheduleSlot.start_time < end_time,
-                ScheduleSlot.end_time >= end_time
+                ScheduleSlot.repeat_type == RepeatType.WEEKLY,
+                occ_isodow == extract("isodow", ScheduleSlot.start_date)
             ),
-            # Новый слот полностью покрывает существующий
+            and_(ScheduleSlot.repeat_type == RepeatType.WEEKDAYS, occ_isodow <= 5),
+            and_(ScheduleSlot.repeat_type == RepeatType.WEEKENDS, occ_isodow >= 6),
             and_(
-                ScheduleSlot.start_time >= start_time,
-                ScheduleSlot.end_time <= end_time
+                ScheduleSlot.repeat_type == RepeatType.CUSTOM,
+                # jsonb-массив содержит число: [0, 2, 4] @> 2
+                cast(ScheduleSlot.repeat_days, JSONB).op("@>")(
+                    func.to_jsonb(cast(occ_isodow, Integer) - 1)
+                )
             )
         )
     )
-    if exclude_id:
-        query = query.filter(ScheduleSlot.id != uuid.UUID(exclude_id))
-    return query.first() is not None
@@ -9,9 +9,11 @@ Spec: 015-real-system-monitoring
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from src.database import get_db
+from src.lib.responses import dumps
 from src.api.schemas.system import (
     SystemMetricsResponse,
     ActivityEventsListResponse,
@@ -25,7 +27,6 @@ router = APIRouter()
 
 @router.get(
     "/metrics",
-    response_model=SystemMetricsResponse,
     summary="Получить системные метрики",
     description="""
     Возвращает текущие метрики системы:
@@ -39,6 +40,7 @@ router = APIRouter()
     """,
     responses={
         200: {
+            "model": SystemMetricsResponse,
             "description": "Системные метрики успешно получены",
             "content": {
                 "application/json": {
@@ -58,17 +60,22 @@ router = APIRouter()
 )
 async def get_system_metrics(
     db: Session = Depends(get_db)
-) -> SystemMetricsResponse:
+) -> Response:
     """
     Получает актуальные системные метрики через psutil и pg_stat_activity.
+    
+    Модель уже проверена при создании в сервисе, поэтому JSON отдаётся
+    напрямую, без повторной проверки через response_model.
     """
     service = get_metrics_service(db)
-    return service.collect_metrics()
+    return Response(
+        content=service.collect_metrics().model_dump_json(),
+        media_type="application/json"
+    )
 
 
 @router.get(
     "/activity",
-    response_model=ActivityEventsListResponse,
     summary="Получить события активности",
     description="""
     Возвращает список событий активности с пагинацией и фильтрацией.
@@ -83,6 +90,7 @@ async def get_system_metrics(
     """,
     responses={
         200: {
+            "model": ActivityEventsListResponse,
             "description": "Список событий успешно получен",
             "content": {
                 "application/json": {
@@ -127,14 +135,18 @@ async def get_activity_events(
         description="Поиск по тексту сообщения"
     ),
     db: Session = Depends(get_db)
-) -> ActivityEventsListResponse:
+) -> Response:
     """
     Получает список событий активности с поддержкой пагинации и фильтрации.
+    
+    События собираются словарями из строк запроса и сериализуются orjson,
+    без промежуточных Pydantic моделей, jsonable_encoder и response_model.
     """
     service = get_activity_service(db)
-    return service.get_events(
+    payload = service.get_events_payload(
         limit=limit,
         offset=offset,
         event_type=type,
         search=search
     )
+    return Response(content=dumps(payload), media_type="application/json")
@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, ConfigDict
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from src.services.telegram_auth import telegram_auth_service, RateLimitError
 from src.services.telegram_rate_limiter import rate_limiter
 from src.services.encryption import encryption_service
 from api.auth import get_current_user
+from api.telegram_errors import (
+    SIGN_IN_ERROR_DETAILS,
+    handle_rate_limit_error,
+    record_flood_wait,
+    sign_in_error,
+)
 from src.models.user import User
 from sqlalchemy.orm import Session
 from src.database import get_db
+from src.lib.responses import dumps
 from src.models.telegram import TelegramAccount
 from pyrogram import Client
 from typing import List, Optional
+import asyncio
 import uuid
 import logging
 
@@ -36,30 +44,23 @@ class TelegramAccountResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-def _handle_rate_limit_error(e: RateLimitError) -> HTTPException:
-    """Преобразует RateLimitError в HTTPException с детальной информацией"""
-    limit_info = e.limit_info
-    return HTTPException(
-        status_code=429,
-        detail={
-            "error": "rate_limit",
-            "type": limit_info.type.value,
-            "message": limit_info.message,
-            "wait_seconds": limit_info.wait_seconds,
-            "remaining_seconds": limit_info.remaining_seconds,
-            "retry_after": limit_info.retry_after.isoformat() if limit_info.retry_after else None,
-        },
-        headers={"Retry-After": str(limit_info.remaining_seconds)} if limit_info.remaining_seconds > 0 else None
-    )
-
-
-@router.get("/accounts", response_model=List[TelegramAccountResponse])
+@router.get("/accounts", responses={200: {"model": List[TelegramAccountResponse]}})
 def list_accounts(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    accounts = db.query(TelegramAccount).filter(TelegramAccount.user_id == current_user.id).all()
-    return accounts
+    # Списки отдаются напрямую из строк БД: выбираются только колонки
+    # TelegramAccountResponse (без ORM-объектов с зашифрованной сессией),
+    # а JSON собирает orjson без повторной проверки через response_model.
+    # Модель остаётся в responses= для схемы OpenAPI
+    rows = db.query(
+        TelegramAccount.id,
+        TelegramAccount.phone,
+        TelegramAccount.first_name,
+        TelegramAccount.username,
+        TelegramAccount.photo_url
+    ).filter(TelegramAccount.user_id == current_user.id).all()
+    return Response(content=dumps([row._asdict() for row in rows]), media_type="application/json")
 
 
 class DialogInfo(BaseModel):
@@ -74,7 +75,16 @@ class DialogInfo(BaseModel):
     is_admin: bool = False
 
 
-@router.get("/accounts/{account_id}/dialogs", response_model=List[DialogInfo])
+# Одновременные запросы прав в диалогах: параллельно, но без всплеска
+# запросов, на который Telegram отвечает FLOOD_WAIT
+_MEMBER_LOOKUP_CONCURRENCY = 10
+
+# Диалоги уже собраны моделями DialogInfo: список сериализуется в JSON
+# pydantic-core за один вызов, без повторной проверки через response_model
+_DIALOG_LIST = TypeAdapter(List[DialogInfo])
+
+
+@router.get("/accounts/{account_id}/dialogs", responses={200: {"model": List[DialogInfo]}})
 async def get_account_dialogs(
     account_id: uuid.UUID,
     filter_type: Optional[str] = None,  # 'channels', 'groups', 'all'
@@ -122,6 +132,7 @@ async def get_account_dialogs(
         
         async with client:
             # Получаем диалоги с лимитом 100 для быстрой загрузки
+            chats = []
             async for dialog in client.get_dialogs(limit=100):
                 chat = dialog.chat
                 
@@ -142,41 +153,56 @@ async def get_account_dialogs(
                 if filter_type == "groups" and chat_type not in ("group", "supergroup"):
                     continue
                 
-                # Проверяем права администратора
-                is_creator = False
-                is_admin = False
-                
-                try:
-                    # Для каналов и супергрупп проверяем права
-                    if chat_type in ("channel", "supergroup"):
-                        member = await client.get_chat_member(chat.id, "me")
-                        is_creator = member.status.value == "owner"
-                        is_admin = member.status.value in ("owner", "administrator")
-                except Exception:
-                    # Если не можем получить права, пропускаем
-                    pass
-                
-                # Формируем URL фото
-                photo_url = None
-                if chat.photo:
-                    # Можно добавить скачивание фото, но пока оставим None
-                    pass
-                
-                dialogs.append(DialogInfo(
-                    id=chat.id,
-                    title=chat.title or chat.first_name or "Unknown",
-                    type=chat_type,
-                    username=chat.username,
-                    members_count=chat.members_count,
-                    photo_url=photo_url,
-                    is_creator=is_creator,
-                    is_admin=is_admin
-                ))
+                chats.append((chat, chat_type))
+            
+            # Права администратора в каналах и супергруппах запрашиваются
+            # параллельно (не больше _MEMBER_LOOKUP_CONCURRENCY запросов
+            # одновременно), а не по одному round-trip на диалог
+            semaphore = asyncio.Semaphore(_MEMBER_LOOKUP_CONCURRENCY)
+            
+            async def get_own_status(chat_id: int) -> str:
+                async with semaphore:
+                    member = await client.get_chat_member(chat_id, "me")
+                return member.status.value
+            
+            candidates = [
+                chat.id for chat, chat_type in chats
+                if chat_type in ("channel", "supergroup")
+            ]
+            results = await asyncio.gather(
+                *(get_own_status(chat_id) for chat_id in candidates),
+                return_exceptions=True
+            )
+            # Если не можем получить права, считаем что их нет
+            statuses = {
+                chat_id: result for chat_id, result in zip(candidates, results)
+                if not isinstance(result, BaseException)
+            }
+        
+        for chat, chat_type in chats:
+            status_value = statuses.get(chat.id)
+            
+            # Формируем URL фото
+            photo_url = None
+            if chat.photo:
+                # Можно добавить скачивание фото, но пока оставим None
+                pass
+            
+            dialogs.append(DialogInfo(
+                id=chat.id,
+                title=chat.title or chat.first_name or "Unknown",
+                type=chat_type,
+                username=chat.username,
+                members_count=chat.members_count,
+                photo_url=photo_url,
+                is_creator=status_value == "owner",
+                is_admin=status_value in ("owner", "administrator")
+            ))
         
         # Сортируем: сначала где админ, потом по названию
         dialogs.sort(key=lambda d: (not d.is_admin, d.title.lower()))
         
-        return dialogs
+        return Response(content=_DIALOG_LIST.dump_json(dialogs), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Failed to get dialogs for account {account_id}: {e}")
@@ -214,7 +240,7 @@ async def send_code(request: PhoneRequest, current_user: User = Depends(get_curr
         result = await telegram_auth_service.send_code(request.phone)
         return result
     except RateLimitError as e:
-        raise _handle_rate_limit_error(e)
+        raise handle_rate_limit_error(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -225,25 +251,14 @@ async def resend_code(request: PhoneRequest, current_user: User = Depends(get_cu
         result = await telegram_auth_service.resend_code(request.phone)
         return result
     except RateLimitError as e:
-        raise _handle_rate_limit_error(e)
+        raise handle_rate_limit_error(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         error_msg = str(e)
         if "FLOOD_WAIT" in error_msg or "UNAVAILABLE" in error_msg:
             # Попробуем распарсить как лимит
-            limit_info = rate_limiter.parse_error(e)
-            limit_info.phone = request.phone
-            await rate_limiter.record_limit(request.phone, limit_info)
-            raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": "rate_limit",
-                    "type": limit_info.type.value,
-                    "message": limit_info.message,
-                    "wait_seconds": limit_info.wait_seconds,
-                }
-            )
+            raise await record_flood_wait(e, request.phone)
         raise HTTPException(status_code=400, detail=error_msg)
 
 @router.post("/login")
@@ -257,27 +272,15 @@ async def login(request: LoginRequest, current_user: User = Depends(get_current_
         )
         return result
     except RateLimitError as e:
-        raise _handle_rate_limit_error(e)
+        raise handle_rate_limit_error(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         error_msg = str(e)
         # Handle specific Telegram errors with user-friendly messages
-        if "PHONE_CODE_EXPIRED" in error_msg:
-            raise HTTPException(status_code=400, detail="Code expired. Please request a new code.")
-        elif "PHONE_CODE_INVALID" in error_msg:
-            raise HTTPException(status_code=400, detail="Invalid code. Please check and try again.")
-        elif "FLOOD_WAIT" in error_msg:
-            limit_info = rate_limiter.parse_error(e)
-            limit_info.phone = request.phone
-            await rate_limiter.record_limit(request.phone, limit_info)
-            raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": "rate_limit",
-                    "type": limit_info.type.value,
-                    "message": limit_info.message,
-                    "wait_seconds": limit_info.wait_seconds,
-                }
-            )
+        known_error = sign_in_error(error_msg, SIGN_IN_ERROR_DETAILS)
+        if known_error:
+            raise known_error
+        if "FLOOD_WAIT" in error_msg:
+            raise await record_flood_wait(e, request.phone)
         raise HTTPException(status_code=500, detail=error_msg)
@@ -0,0 +1,66 @@
+"""
+Общая обработка ошибок Telegram-авторизации для роутеров
+telegram_auth (привязка аккаунта) и telegram_login (страница входа).
+"""
+from typing import Mapping, Optional
+from fastapi import HTTPException
+from src.services.telegram_auth import RateLimitError
+from src.services.telegram_rate_limiter import rate_limiter
+
+
+# Понятные пользователю сообщения для ошибок Telegram при входе по коду.
+# Хранятся только тексты: HTTPException создаётся на каждый raise, чтобы
+# traceback и контекст одного запроса не накапливались в общем объекте.
+# Привязка аккаунта отвечает по-английски, страница входа — по-русски
+SIGN_IN_ERROR_DETAILS = {
+    "PHONE_CODE_EXPIRED": "Code expired. Please request a new code.",
+    "PHONE_CODE_INVALID": "Invalid code. Please check and try again.",
+}
+
+LOGIN_PAGE_ERROR_DETAILS = {
+    "PHONE_CODE_EXPIRED": "Код истёк. Запросите новый код.",
+    "PHONE_CODE_INVALID": "Неверный код. Проверьте и попробуйте снова.",
+    "PASSWORD_HASH_INVALID": "Неверный пароль 2FA.",
+}
+
+
+def handle_rate_limit_error(e: RateLimitError) -> HTTPException:
+    """Преобразует RateLimitError в HTTPException с детальной информацией"""
+    limit_info = e.limit_info
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": "rate_limit",
+            "type": limit_info.type.value,
+            "message": limit_info.message,
+            "wait_seconds": limit_info.wait_seconds,
+            "remaining_seconds": limit_info.remaining_seconds,
+            "retry_after": limit_info.retry_after.isoformat() if limit_info.retry_after else None,
+        },
+        headers={"Retry-After": str(limit_info.remaining_seconds)} if limit_info.remaining_seconds > 0 else None
+    )
+
+
+def sign_in_error(error_msg: str, details: Mapping[str, str]) -> Optional[HTTPException]:
+    """
+    Ответ 400 для известной ошибки входа по коду.
+
+    Args:
+        error_msg: Текст ошибки Telegram
+        details: Таблица «код ошибки → сообщение» роутера
+
+    Returns:
+        HTTPException или None, если ошибка не из таблицы
+    """
+    for token, detail in details.items():
+        if token in error_msg:
+            return HTTPException(status_code=400, detail=detail)
+    return None
+
+
+async def record_flood_wait(e: Exception, phone: str) -> HTTPException:
+    """Сохраняет лимит из FLOOD_WAIT ошибки Telegram и возвращает ответ 429"""
+    limit_info = rate_limiter.parse_error(e)
+    limit_info.phone = phone
+    await rate_limiter.record_limit(phone, limit_info)
+    return handle_rate_limit_error(RateLimitError(limit_info))
@@ -7,6 +7,12 @@ from pydantic import BaseModel
 from typing import Union
 from src.services.telegram_auth import telegram_auth_service, RateLimitError
 from src.services.telegram_rate_limiter import rate_limiter
+from api.telegram_errors import (
+    LOGIN_PAGE_ERROR_DETAILS,
+    handle_rate_limit_error,
+    record_flood_wait,
+    sign_in_error,
+)
 from src.services.encryption import encryption_service
 from sqlalchemy.orm import Session
 from src.database import get_db
@@ -39,23 +45,6 @@ class TwoFARequiredResponse(BaseModel):
     message: str = "Введите пароль двухфакторной аутентификации"
 
 
-def _handle_rate_limit_error(e: RateLimitError) -> HTTPException:
-    """Преобразует RateLimitError в HTTPException с детальной информацией"""
-    limit_info = e.limit_info
-    return HTTPException(
-        status_code=429,
-        detail={
-            "error": "rate_limit",
-            "type": limit_info.type.value,
-            "message": limit_info.message,
-            "wait_seconds": limit_info.wait_seconds,
-            "remaining_seconds": limit_info.remaining_seconds,
-            "retry_after": limit_info.retry_after.isoformat() if limit_info.retry_after else None,
-        },
-        headers={"Retry-After": str(limit_info.remaining_seconds)} if limit_info.remaining_seconds > 0 else None
-    )
-
-
 @router.post("/send-code")
 async def send_code_public(request: PhoneRequest):
     """
@@ -66,14 +55,11 @@ async def send_code_public(request: PhoneRequest):
         result = await telegram_auth_service.send_code(request.phone)
         return result
     except RateLimitError as e:
-        raise _handle_rate_limit_error(e)
+        raise handle_rate_limit_error(e)
     except Exception as e:
         error_msg = str(e)
         if "FLOOD_WAIT" in error_msg or "UNAVAILABLE" in error_msg:
-            limit_info = rate_limiter.parse_error(e)
-            limit_info.phone = request.phone
-            await rate_limiter.record_limit(request.phone, limit_info)
-            raise _handle_rate_limit_error(RateLimitError(limit_info))
+            raise await record_flood_wait(e, request.phone)
         raise HTTPException(status_code=400, detail=error_msg)
 
 
@@ -172,22 +158,16 @@ async def login_public(request: LoginRequest, db: Session = Depends(get_db)):
         return TokenResponse(access_token=access_token)
     
     except RateLimitError as e:
-        raise _handle_rate_limit_error(e)
+        raise handle_rate_limit_error(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         error_msg = str(e)
-        if "PHONE_CODE_EXPIRED" in error_msg:
-            raise HTTPException(status_code=400, detail="Код истёк. Запросите новый код.")
-        elif "PHONE_CODE_INVALID" in error_msg:
-            raise HTTPException(status_code=400, detail="Неверный код. Проверьте и попробуйте снова.")
-        elif "PASSWORD_HASH_INVALID" in error_msg:
-            raise HTTPException(status_code=400, detail="Неверный пароль 2FA.")
-        elif "FLOOD_WAIT" in error_msg:
-            limit_info = rate_limiter.parse_error(e)
-            limit_info.phone = request.phone
-            await rate_limiter.record_limit(request.phone, limit_info)
-            raise _handle_rate_limit_error(RateLimitError(limit_info))
+        known_error = sign_in_error(error_msg, LOGIN_PAGE_ERROR_DETAILS)
+        if known_error:
+            raise known_error
+        if "FLOOD_WAIT" in error_msg:
+            raise await record_flood_wait(e, request.phone)
         raise HTTPException(status_code=500, detail=error_msg)
 
 
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 import os
 from dotenv import load_dotenv
@@ -75,20 +76,37 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("No DATABASE_URL set for SQLAlchemy")
 
+# Compiled SQL cache: the default (500) is too small once every router's
+# statements plus their per-dialect variants are counted
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
 if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
         connect_args={"check_same_thread": False},
-        pool_pre_ping=True
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+elif os.getenv("DB_NULLPOOL", "").lower() in ("1", "true", "yes"):
+    # Behind PgBouncer in transaction mode pooling is done by PgBouncer;
+    # a second pool on the app side would pin server connections
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        poolclass=NullPool,
+        query_cache_size=QUERY_CACHE_SIZE,
     )
 else:
+    # Pool limits can be tuned per deployment; pool_size + max_overflow should
+    # cover the threadpool (40 workers by default) that runs sync handlers
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
-        pool_size=20,           # Increased from 10
-        max_overflow=30,        # Increased from 20
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "30")),
         pool_pre_ping=True,
-        pool_recycle=1800,      # Recycle connections after 30 min (was 1 hour)
-        pool_timeout=10,        # Fail fast instead of waiting 30s
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),  # Recycle connections after 30 min
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "10")),    # Fail fast instead of waiting 30s
+        pool_use_lifo=True,     # Reuse the most recently returned (warm) connection
+        query_cache_size=QUERY_CACHE_SIZE,
     )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
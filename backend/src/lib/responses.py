@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Классы HTTP-ответов на базе orjson.
+
+orjson сериализует UUID, datetime/date и Enum нативно (на стороне C),
+поэтому в обработчиках не нужно заранее приводить такие поля к str.
+
+Пример использования:
+    from src.lib.responses import ORJSONResponse
+
+    app = FastAPI(default_response_class=ORJSONResponse)
+"""
+
+import json
+import logging
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Попытка импорта orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson не установлен, используется стандартный json (pip install orjson)")
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Приведение типов, не поддерживаемых стандартным json.
+
+    date/datetime/time выводятся в ISO 8601, как это делают orjson и pydantic.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Сериализует данные в JSON-байты.
+
+    Args:
+        content: JSON-совместимые данные (допускаются UUID, datetime, Enum)
+
+    Returns:
+        JSON в виде bytes
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON-ответ, сериализуемый через orjson.
+
+    Без установленного orjson откатывается на стандартный json.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -42,6 +42,8 @@ from api.queue import router as queue_router  # noqa: E402
 from api.metrics import router as metrics_router  # noqa: E402
 from src.api.analytics import router as analytics_router, internal_router as analytics_internal_router  # noqa: E402
 from src.api.internal import router as internal_router  # noqa: E402
+from src.lib.responses import ORJSONResponse  # noqa: E402
+from src.services.prometheus_metrics import observe_db_pool  # noqa: E402
 from database import engine, Base
 
 
@@ -61,6 +63,8 @@ async def app_lifespan(fastapi_app: FastAPI):
         except Exception as e:
             print(f"Failed to initialize Redis rate limiter: {e}")
     
+    observe_db_pool(engine.pool)
+    
     try:
         from src.admin import setup_admin
         await setup_admin(fastapi_app, engine)
@@ -77,6 +81,7 @@ app = FastAPI(
 
     version="0.1.0",
     lifespan=app_lifespan,
+    default_response_class=ORJSONResponse,
 
 )
 
@@ -9,7 +9,7 @@ from enum import Enum as PyEnum
 from sqlalchemy import (
     Column, String, DateTime, Date, Time, 
     ForeignKey, Boolean, Enum, Integer, Text,
-    func
+    Index, func, text
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.sqlite import JSON
@@ -73,6 +73,19 @@ class ScheduleSlot(Base):
     channel = relationship("Channel", backref="schedule_slots")
     creator = relationship("User", foreign_keys=[created_by])
 
+    __table_args__ = (
+        # Слоты канала по диапазону дат (список, календарь, развёртка)
+        # в порядке (start_date, start_time) — без сортировки после индекса.
+        # playlist_id в INCLUDE: текущий слот стримера (с фильтром
+        # playlist_id IS NOT NULL) читается index-only scan
+        Index(
+            "ix_slot_channel_active_date_time",
+            "channel_id", "start_date", "start_time", "end_time",
+            postgresql_where=text("is_active"),
+            postgresql_include=["playlist_id"],
+        ),
+    )
+
     def __repr__(self):
         return f"<ScheduleSlot {self.id}: {self.start_date} {self.start_time}-{self.end_time}>"
 
@@ -161,7 +174,19 @@ class PlaylistGroup(Base):
     # Relationships
     user = relationship("User", backref="playlist_groups")
     channel = relationship("Channel", backref="playlist_groups")
-    playlists = relationship("Playlist", back_populates="group", order_by="Playlist.position")
+    playlists = relationship(
+        "Playlist", back_populates="group", order_by="[Playlist.position, Playlist.name]"
+    )
+
+    __table_args__ = (
+        # Список групп пользователя: частичный индекс только по активным
+        # строкам в порядке сортировки списка (position, name)
+        Index(
+            "ix_playlist_groups_user_active_pos",
+            "user_id", "position", "name",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     def __repr__(self):
         return f"<PlaylistGroup {self.id}: {self.name}>"
@@ -223,15 +248,50 @@ class Playlist(Base):
     channel = relationship("Channel", backref="playlists")
     group = relationship("PlaylistGroup", back_populates="playlists")
 
+    __table_args__ = (
+        # Список плейлистов пользователя (ORDER BY name) и плейлисты группы
+        # (счётчики групп, вложенные списки): частичные индексы по активным
+        Index(
+            "ix_playlists_user_active_name",
+            "user_id", "name",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_playlists_group_active_pos",
+            "group_id", "position", "name",
+            postgresql_where=text("is_active"),
+        ),
+        # Самый новый плейлист канала для стримера (ORDER BY created_at DESC
+        # читается обратным проходом индекса)
+        Index(
+            "ix_playlists_channel_active_created",
+            "channel_id", "created_at",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
     def __repr__(self):
         return f"<Playlist {self.id}: {self.name} ({self.items_count} items)>"
 
+    @staticmethod
+    def items_stats(items) -> dict:
+        """
+        Статистика items_count/total_duration для списка элементов.
+        
+        Единственное место расчёта: конструктор и эндпоинты записи items
+        берут значения отсюда, поэтому колонки не расходятся с items.
+        Длительность null (неизвестна, например у импортированных ссылок)
+        считается нулевой.
+        """
+        items = items or []
+        return {
+            'items_count': len(items),
+            'total_duration': int(sum(item.get('duration') or 0 for item in items)),
+        }
+
     def __init__(self, *args, **kwargs):
         # Ensure items and stats are computed when created via constructor
-        items = kwargs.get('items') or []
         # If caller didn't provide explicit items_count/total_duration, compute them
-        if 'items_count' not in kwargs:
-            kwargs['items_count'] = len(items)
-        if 'total_duration' not in kwargs:
-            kwargs['total_duration'] = sum(item.get('duration', 0) for item in items)
+        for key, value in self.items_stats(kwargs.get('items')).items():
+            kwargs.setdefault(key, value)
         super().__init__(*args, **kwargs)
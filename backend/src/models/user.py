@@ -12,6 +12,10 @@ class UserRole(str, PyEnum):
     SUPERADMIN = "superadmin"
 
 
+# Роли с правами администратора; роль сравнивается без учёта регистра
+ADMIN_ROLES = frozenset({UserRole.ADMIN.value, UserRole.SUPERADMIN.value})
+
+
 class UserStatus(str, PyEnum):
     """Статусы пользователей."""
     PENDING = "pending"
@@ -76,4 +80,4 @@ class User(Base):
     @property
     def is_admin(self) -> bool:
         """Проверяет, является ли пользователь администратором."""
-        return self.role in (UserRole.ADMIN.value, UserRole.SUPERADMIN.value, "admin", "superadmin")
\ No newline at end of file
+        return (self.role or "").lower() in ADMIN_ROLES
\ No newline at end of file
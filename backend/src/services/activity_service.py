@@ -106,11 +106,81 @@ class ActivityService:
         Returns:
             ActivityEventsListResponse со списком событий и общим количеством
         """
+        events, total = self._query_events(limit, offset, event_type, search)
+
+        # Преобразование в Pydantic модели
+        event_responses = [
+            ActivityEventResponse(
+                id=event.id,
+                type=event.type,
+                message=event.message,
+                user_email=event.user_email,
+                details=event.details,
+                created_at=event.created_at
+            )
+            for event in events
+        ]
+
+        return ActivityEventsListResponse(
+            events=event_responses,
+            total=total
+        )
+
+    def get_events_payload(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        event_type: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Получает список событий в виде JSON-совместимого словаря.
+        
+        Структура совпадает с ActivityEventsListResponse, но события
+        собираются словарями прямо из строк запроса, без создания
+        Pydantic моделей — для сериализации ответа API через orjson.
+        
+        Args:
+            limit: Максимальное количество записей (1-100)
+            offset: Смещение для пагинации
+            event_type: Фильтр по типу события (опционально)
+            search: Поиск по тексту сообщения (опционально)
+        
+        Returns:
+            {"events": [...], "total": n}
+        """
+        events, total = self._query_events(limit, offset, event_type, search)
+        return {
+            "events": [row._asdict() for row in events],
+            "total": total,
+        }
+
+    def _query_events(
+        self,
+        limit: int,
+        offset: int,
+        event_type: Optional[str],
+        search: Optional[str]
+    ) -> tuple[list, int]:
+        """
+        Выбирает страницу событий и общее количество.
+        
+        Returns:
+            (строки с полями ActivityEventResponse, общее количество)
+        """
         # Валидация параметров
         limit = max(1, min(100, limit))
         offset = max(0, offset)
 
-        query = self.db.query(ActivityEvent)
+        # События только читаются: выбираются колонки ответа, без ORM-объектов
+        query = self.db.query(
+            ActivityEvent.id,
+            ActivityEvent.type,
+            ActivityEvent.message,
+            ActivityEvent.user_email,
+            ActivityEvent.details,
+            ActivityEvent.created_at
+        )
 
         # Фильтр по типу
         if event_type:
@@ -131,24 +201,7 @@ class ActivityService:
             .limit(limit)
             .all()
         )
-
-        # Преобразование в Pydantic модели
-        event_responses = [
-            ActivityEventResponse(
-                id=event.id,
-                type=event.type,
-                message=event.message,
-                user_email=event.user_email,
-                details=event.details,
-                created_at=event.created_at
-            )
-            for event in events
-        ]
-
-        return ActivityEventsListResponse(
-            events=event_responses,
-            total=total
-        )
+        return events, total
 
     def _cleanup_old_events(self) -> None:
         """
@@ -13,6 +13,7 @@ Prometheus Metrics Service
 - sattva_websocket_connections: WebSocket соединения
 - sattva_http_requests_total: HTTP запросы
 - sattva_http_request_duration_seconds: Latency запросов
+- sattva_db_pool_connections: Состояние пула соединений SQLAlchemy
 
 Использование:
     from src.services.prometheus_metrics import (
@@ -192,6 +193,13 @@ APP_UPTIME = Gauge(
     'Application uptime in seconds'
 )
 
+# Значения читаются из пула в момент сбора метрик (observe_db_pool)
+DB_POOL_CONNECTIONS = Gauge(
+    'sattva_db_pool_connections',
+    'SQLAlchemy connection pool state',
+    ['state']
+)
+
 
 # ==============================================================================
 # Admin Panel Metrics
@@ -543,6 +551,29 @@ def reset_channel_metrics(channel_id: int | str) -> None:
         logger.warning(f"Error resetting channel metrics: {e}")
 
 
+def observe_db_pool(pool) -> None:
+    """
+    Экспорт состояния пула соединений SQLAlchemy.
+    
+    Gauge читают счётчики пула при каждом сборе метрик: size — настроенный
+    размер, checked_in — свободные, checked_out — занятые запросами,
+    overflow — открытые сверх pool_size. Пулы без счётчиков (NullPool,
+    StaticPool) пропускаются.
+    
+    Args:
+        pool: engine.pool
+    """
+    for state, method in (
+        ("size", "size"),
+        ("checked_in", "checkedin"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ):
+        counter = getattr(pool, method, None)
+        if counter is not None:
+            DB_POOL_CONNECTIONS.labels(state=state).set_function(counter)
+
+
 def init_app_info(version: str, python_version: str, environment: str) -> None:
     """
     Инициализировать информацию о приложении.
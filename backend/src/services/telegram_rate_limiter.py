@@ -205,9 +205,13 @@ class TelegramRateLimiter:
         r = await self._get_redis()
         try:
             key = f"{self.REDIS_PREFIX}:{phone}"
+            counter_key = f"{self.REDIS_PREFIX}:stats:{limit_info.type.value}"
+            
+            # Все команды уходят в Redis одним round-trip
+            pipe = r.pipeline(transaction=False)
             
             # Сохраняем информацию о лимите
-            await r.hset(key, mapping={
+            pipe.hset(key, mapping={
                 "type": limit_info.type.value,
                 "wait_seconds": str(limit_info.wait_seconds),
                 "retry_after": limit_info.retry_after.isoformat() if limit_info.retry_after else "",
@@ -217,12 +221,13 @@ class TelegramRateLimiter:
             
             # Устанавливаем TTL на время лимита + буфер
             if limit_info.wait_seconds > 0:
-                await r.expire(key, limit_info.wait_seconds + 60)
+                pipe.expire(key, limit_info.wait_seconds + 60)
             
             # Инкрементируем счётчик ошибок для аналитики
-            counter_key = f"{self.REDIS_PREFIX}:stats:{limit_info.type.value}"
-            await r.incr(counter_key)
-            await r.expire(counter_key, 86400)  # Статистика за 24 часа
+            pipe.incr(counter_key)
+            pipe.expire(counter_key, 86400)  # Статистика за 24 часа
+            
+            await pipe.execute()
             
             logger.info(f"[RateLimiter] Recorded limit for {phone}: {limit_info.type.value}, wait={limit_info.wait_seconds}s")
             
@@ -106,6 +106,45 @@ def extract_video_metadata(url: str, extract_audio_only: bool = False) -> dict:
         return {"error": str(e)}
 
 
+def _insert_playlist_entries(db, entries: list, channel_id: Optional[str] = None) -> int:
+    """
+    Добавление видео плейлиста в очередь одним пакетным INSERT.
+    
+    Строки вставляются через Core insert с executemany: драйвер
+    отправляет их многострочными INSERT, без unit of work ORM
+    и отдельного объекта на каждое видео.
+    
+    Args:
+        db: Сессия базы данных
+        entries: Видео плейлиста из extract_video_metadata
+        channel_id: Опционально - ID канала для привязки
+        
+    Returns:
+        Количество добавленных элементов
+    """
+    from sqlalchemy import func, insert
+    from src.models.playlist import PlaylistItem
+    
+    # Следующая позиция — MAX(position) + 1 без загрузки последней строки
+    last_position = db.query(func.max(PlaylistItem.position)).scalar()
+    position = (last_position + 1) if last_position is not None else 0
+    
+    rows = [
+        {
+            "url": entry["url"],
+            "title": entry.get("title") or entry["url"],
+            "type": "youtube",
+            "position": position + i,
+            "duration": entry.get("duration"),
+            "channel_id": channel_id,
+        }
+        for i, entry in enumerate(e for e in entries if e.get("url"))
+    ]
+    if rows:
+        db.execute(insert(PlaylistItem), rows)
+    return len(rows)
+
+
 def update_playlist_item_metadata(item_id: str, metadata: dict) -> bool:
     """
     Обновляет playlist item в БД с полученными метаданными.
@@ -217,33 +256,12 @@ if CELERY_AVAILABLE and os.getenv('CELERY_BROKER_URL'):
             return {"success": False, "error": "URL is not a playlist"}
         
         entries = metadata.get("entries", [])
-        added_count = 0
         
         from database import SessionLocal
-        from src.models.playlist import PlaylistItem
         
         db = SessionLocal()
         try:
-            # Получаем последнюю позицию
-            last_item = db.query(PlaylistItem).order_by(PlaylistItem.position.desc()).first()
-            position = (last_item.position + 1) if last_item else 0
-            
-            for entry in entries:
-                if not entry.get("url"):
-                    continue
-                    
-                new_item = PlaylistItem(
-                    url=entry["url"],
-                    title=entry.get("title") or entry["url"],
-                    type="youtube",
-                    position=position,
-                    duration=entry.get("duration"),
-                    channel_id=channel_id,
-                )
-                db.add(new_item)
-                position += 1
-                added_count += 1
-            
+            added_count = _insert_playlist_entries(db, entries, channel_id)
             db.commit()
             logger.info(f"Added {added_count} items from playlist {playlist_url}")
             
@@ -346,7 +364,6 @@ def import_playlist_async(playlist_url: str, channel_id: Optional[str] = None) -
     logger.warning("Celery not available, playlist import may be slow")
     try:
         from database import SessionLocal
-        from src.models.playlist import PlaylistItem
         
         metadata = extract_video_metadata(playlist_url)
         if metadata.get("error") or not metadata.get("is_playlist"):
@@ -354,23 +371,7 @@ def import_playlist_async(playlist_url: str, channel_id: Optional[str] = None) -
         
         db = SessionLocal()
         try:
-            last_item = db.query(PlaylistItem).order_by(PlaylistItem.position.desc()).first()
-            position = (last_item.position + 1) if last_item else 0
-            
-            for entry in metadata.get("entries", []):
-                if not entry.get("url"):
-                    continue
-                new_item = PlaylistItem(
-                    url=entry["url"],
-                    title=entry.get("title") or entry["url"],
-                    type="youtube",
-                    position=position,
-                    duration=entry.get("duration"),
-                    channel_id=channel_id,
-                )
-                db.add(new_item)
-                position += 1
-            
+            _insert_playlist_entries(db, metadata.get("entries", []), channel_id)
             db.commit()
             return True
         finally:
@@ -9,6 +9,7 @@
 - Валидация данных
 """
 
+import json
 import pytest
 from datetime import date, time, timedelta
 from uuid import uuid4
@@ -137,7 +138,39 @@ class TestScheduleSlots:
         data = response.json()
         assert len(data) == 1
         assert data[0]["title"] == "Morning Show"
+        assert data[0]["playlist_name"] == "Test Playlist"
+        assert data[0]["start_time"] == "10:00"
+        assert data[0]["id"] == str(test_slot.id)
     
+    def test_get_slots_invalid_channel_id(
+        self,
+        client,
+        admin_auth_headers: dict,
+    ):
+        """Некорректный ID канала — отклоняется валидацией, как и остальные ID — ошибка 422."""
+        response = client.get(
+            "/api/schedule/slots",
+            params={
+                "channel_id": "not-a-uuid",
+                "start_date": str(date.today()),
+                "end_date": str(date.today() + timedelta(days=7)),
+            },
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 422
+
+    def test_delete_slot_invalid_id(
+        self,
+        client,
+        admin_auth_headers: dict,
+    ):
+        """Некорректный ID слота отклоняется валидацией — ошибка 422."""
+        response = client.delete(
+            "/api/schedule/slots/not-a-uuid",
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_create_slot_success(
         self,
@@ -340,6 +373,86 @@ class TestPlaylists:
         assert len(data) == 1
         assert data[0]["name"] == "Test Playlist"
     
+    @pytest.mark.asyncio
+    async def test_get_playlists_without_items(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """Список без items сохраняет счётчики."""
+        response = await async_client.get(
+            "/api/schedule/playlists",
+            params={"include_items": "false"},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["items"] == []
+        assert data[0]["items_count"] == 2
+        assert data[0]["id"] == str(test_playlist.id)
+    
+    @pytest.mark.asyncio
+    async def test_get_playlists_reflects_new_playlist(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """Кэш списка плейлистов сбрасывается при создании плейлиста."""
+        response = await async_client.get("/api/schedule/playlists", headers=admin_auth_headers)
+        assert len(response.json()) == 1
+        
+        response = await async_client.post(
+            "/api/schedule/playlists",
+            json={"name": "Another Playlist", "items": []},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 201
+        
+        response = await async_client.get("/api/schedule/playlists", headers=admin_auth_headers)
+        assert [p["name"] for p in response.json()] == ["Another Playlist", "Test Playlist"]
+
+    @pytest.mark.asyncio
+    async def test_stream_playlists_ndjson(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """Потоковый список отдаёт по одному плейлисту на строку."""
+        response = await async_client.get(
+            "/api/schedule/playlists/stream", headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [p["name"] for p in lines] == ["Test Playlist"]
+        assert len(lines[0]["items"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_playlists_json_array(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """Потоковый список в формате JSON-массива совпадает с обычным списком."""
+        await async_client.post(
+            "/api/schedule/playlists",
+            json={"name": "Another Playlist", "items": []},
+            headers=admin_auth_headers,
+        )
+        response = await async_client.get(
+            "/api/schedule/playlists/stream",
+            params={"format": "json"},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/json")
+        listed = await async_client.get("/api/schedule/playlists", headers=admin_auth_headers)
+        assert response.json() == listed.json()
+
     @pytest.mark.asyncio
     async def test_create_playlist_success(
         self,
@@ -363,6 +476,8 @@ class TestPlaylists:
         data = response.json()
         assert data["name"] == "New Playlist"
         assert len(data["items"]) == 1
+        assert data["items_count"] == 1
+        assert data["created_at"] is not None
     
     @pytest.mark.asyncio
     async def test_create_playlist_empty_name(
@@ -405,6 +520,54 @@ class TestPlaylists:
         data = response.json()
         assert data["name"] == "Updated Playlist Name"
         assert len(data["items"]) == 1
+        assert data["items_count"] == 1
+        assert data["total_duration"] == 120
+    
+    @pytest.mark.asyncio
+    async def test_update_playlist_items_patch(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """items_patch удаляет элементы по индексам и добавляет новые в конец."""
+        payload = {
+            "items_patch": {
+                "remove": [0],
+                "add": [{"url": "https://youtube.com/watch?v=789", "title": "Added", "duration": 60}],
+            },
+        }
+        response = await async_client.put(
+            f"/api/schedule/playlists/{test_playlist.id}",
+            json=payload,
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["title"] for item in data["items"]] == ["Test Video 2", "Added"]
+        assert data["items_count"] == 2
+        assert data["total_duration"] == 300
+        
+        response = await async_client.put(
+            f"/api/schedule/playlists/{test_playlist.id}",
+            json={"items": [], "items_patch": {"add": []}},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 422
+    
+    @pytest.mark.asyncio
+    async def test_update_playlist_not_found(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+    ):
+        """Обновление несуществующего плейлиста — 404."""
+        response = await async_client.put(
+            f"/api/schedule/playlists/{uuid4()}",
+            json={"name": "Missing"},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 404
     
     @pytest.mark.asyncio
     async def test_delete_playlist_success(
@@ -420,6 +583,19 @@ class TestPlaylists:
         )
         assert response.status_code == 204
     
+    @pytest.mark.asyncio
+    async def test_delete_playlist_not_found(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+    ):
+        """Удаление несуществующего плейлиста — 404."""
+        response = await async_client.delete(
+            f"/api/schedule/playlists/{uuid4()}",
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 404
+    
     @pytest.mark.asyncio
     async def test_delete_playlist_in_use(
         self,
@@ -437,6 +613,237 @@ class TestPlaylists:
         assert response.status_code == 409
         assert "in use" in response.json()["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_channel_active_playlist(
+        self,
+        async_client: AsyncClient,
+        db_session,
+        test_playlist: Playlist,
+    ):
+        """Стример получает плейлист, привязанный к каналу."""
+        from src.api.schedule.cache import invalidate_active_playlist
+
+        test_playlist.channel_id = TEST_CHANNEL_ID
+        db_session.commit()
+        # Плейлист изменён напрямую в БД, минуя эндпоинты со сбросом кэша
+        invalidate_active_playlist()
+
+        response = await async_client.get(
+            f"/api/schedule/playlists/channel/{TEST_CHANNEL_ID}/active"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source"] == "channel"
+        assert data["playlist_id"] == str(test_playlist.id)
+        assert len(data["items"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_channel_active_playlist_skips_empty_playlists(
+        self,
+        async_client: AsyncClient,
+        db_session,
+        admin_user: User,
+        test_playlist: Playlist,
+    ):
+        """Более новый пустой плейлист канала пропускается."""
+        from datetime import datetime, timezone
+        from src.api.schedule.cache import invalidate_active_playlist
+
+        test_playlist.channel_id = TEST_CHANNEL_ID
+        test_playlist.created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        db_session.add(Playlist(
+            user_id=admin_user.id,
+            channel_id=TEST_CHANNEL_ID,
+            name="Empty",
+            items=[],
+            created_at=datetime(2024, 6, 1, tzinfo=timezone.utc),
+        ))
+        db_session.commit()
+        invalidate_active_playlist()
+
+        response = await async_client.get(
+            f"/api/schedule/playlists/channel/{TEST_CHANNEL_ID}/active"
+        )
+        data = response.json()
+        assert data["source"] == "channel"
+        assert data["playlist_id"] == str(test_playlist.id)
+
+    @pytest.mark.asyncio
+    async def test_channel_active_playlist_cache_invalidated_on_delete(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        db_session,
+        test_playlist: Playlist,
+    ):
+        """Закэшированный ответ стримеру сбрасывается при удалении плейлиста."""
+        from src.api.schedule.cache import invalidate_active_playlist
+
+        test_playlist.channel_id = TEST_CHANNEL_ID
+        db_session.commit()
+        invalidate_active_playlist()
+        url = f"/api/schedule/playlists/channel/{TEST_CHANNEL_ID}/active"
+
+        first = await async_client.get(url)
+        assert first.json()["source"] == "channel"
+        cached = await async_client.get(url)
+        assert cached.content == first.content
+
+        response = await async_client.delete(
+            f"/api/schedule/playlists/{test_playlist.id}",
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 204
+
+        response = await async_client.get(url)
+        assert response.json()["source"] == "none"
+
+    @pytest.mark.asyncio
+    async def test_channel_active_playlist_from_schedule(
+        self,
+        async_client: AsyncClient,
+        test_slot: ScheduleSlot,
+        test_playlist: Playlist,
+    ):
+        """Плейлист текущего слота расписания важнее плейлистов канала."""
+        from datetime import datetime, timezone
+        from src.main import app
+        from src.api.schedule import now_utc
+        from src.api.schedule.cache import invalidate_active_playlist
+
+        slot_now = datetime.combine(test_slot.start_date, time(11, 0), tzinfo=timezone.utc)
+        app.dependency_overrides[now_utc] = lambda: slot_now
+        invalidate_active_playlist()
+        try:
+            response = await async_client.get(
+                f"/api/schedule/playlists/channel/{TEST_CHANNEL_ID}/active"
+            )
+        finally:
+            app.dependency_overrides.pop(now_utc, None)
+            invalidate_active_playlist()
+        data = response.json()
+        assert data["source"] == "schedule"
+        assert data["playlist_id"] == str(test_playlist.id)
+
+    @pytest.mark.asyncio
+    async def test_channel_active_playlist_not_modified(
+        self,
+        async_client: AsyncClient,
+        db_session,
+        test_playlist: Playlist,
+    ):
+        """Повторный опрос с If-None-Match получает 304 без тела."""
+        from src.api.schedule.cache import invalidate_active_playlist
+
+        test_playlist.channel_id = TEST_CHANNEL_ID
+        db_session.commit()
+        invalidate_active_playlist()
+        url = f"/api/schedule/playlists/channel/{TEST_CHANNEL_ID}/active"
+
+        first = await async_client.get(url)
+        etag = first.headers["etag"]
+
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = await async_client.get(url, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert response.content == first.content
+
+    def test_list_cache_invalidate_user_uses_scope_index(self):
+        """Сброс списков пользователя удаляет ключи из индекса scope, не трогая чужие."""
+        from fakeredis import FakeRedis
+        from src.api.schedule.cache import ListCache
+
+        cache = ListCache()
+        cache._redis = FakeRedis(decode_responses=True)
+        cache.set("playlists", "u1", None, b"[1]")
+        cache.set("groups", "u1", "ch", b"[2]")
+        cache.set("playlists", "all", None, b"[3]")
+        cache.set("playlists", "u2", None, b"[4]")
+        cache._redis.set("ratelimit:x", "1")
+
+        cache.invalidate_user("u1")
+
+        assert cache.get("playlists", "u1", None) is None
+        assert cache.get("groups", "u1", "ch") is None
+        assert cache.get("playlists", "all", None) is None
+        assert cache.get("playlists", "u2", None) == b"[4]"
+        assert cache._redis.get("ratelimit:x") == "1"
+
+
+# ==================== Playlist Groups Tests ====================
+
+class TestPlaylistGroups:
+    """Тесты для групп плейлистов."""
+
+    @pytest.mark.asyncio
+    async def test_create_group_and_move_playlist(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """Создание группы, перемещение плейлиста и счётчик в списке групп."""
+        response = await async_client.post(
+            "/api/schedule/groups",
+            json={"name": "Morning"},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 201
+        group = response.json()
+        assert group["position"] == 0
+        assert group["playlists_count"] == 0
+
+        response = await async_client.post(
+            f"/api/schedule/playlists/{test_playlist.id}/move-to-group",
+            params={"group_id": group["id"], "position": 0},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["group_id"] == group["id"]
+
+        response = await async_client.get("/api/schedule/groups", headers=admin_auth_headers)
+        assert [(g["name"], g["playlists_count"]) for g in response.json()] == [("Morning", 1)]
+
+        response = await async_client.get(
+            "/api/schedule/groups/with-playlists", headers=admin_auth_headers
+        )
+        data = response.json()
+        assert [p["name"] for p in data[0]["playlists"]] == ["Test Playlist"]
+
+    @pytest.mark.asyncio
+    async def test_delete_group_ungroups_playlists(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_playlist: Playlist,
+    ):
+        """Удаление группы переносит её плейлисты в ungrouped."""
+        response = await async_client.post(
+            "/api/schedule/groups",
+            json={"name": "Evening"},
+            headers=admin_auth_headers,
+        )
+        group_id = response.json()["id"]
+        await async_client.post(
+            f"/api/schedule/playlists/{test_playlist.id}/move-to-group",
+            params={"group_id": group_id},
+            headers=admin_auth_headers,
+        )
+
+        response = await async_client.delete(
+            f"/api/schedule/groups/{group_id}", headers=admin_auth_headers
+        )
+        assert response.status_code == 204
+
+        response = await async_client.get("/api/schedule/groups", headers=admin_auth_headers)
+        assert response.json() == []
+        response = await async_client.get("/api/schedule/playlists", headers=admin_auth_headers)
+        assert response.json()[0]["group_id"] is None
+
 
 # ==================== Schedule Templates Tests ====================
 
@@ -495,6 +902,31 @@ class TestScheduleTemplates:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
     
+    @pytest.mark.asyncio
+    async def test_delete_template(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+    ):
+        """Удаление шаблона; повторное удаление — 404."""
+        response = await async_client.post(
+            "/api/schedule/templates",
+            json={"name": "Disposable", "slots": []},
+            headers=admin_auth_headers,
+        )
+        template_id = response.json()["id"]
+        
+        response = await async_client.delete(
+            f"/api/schedule/templates/{template_id}", headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["id"] == template_id
+        
+        response = await async_client.delete(
+            f"/api/schedule/templates/{template_id}", headers=admin_auth_headers
+        )
+        assert response.status_code == 404
+    
     @pytest.mark.asyncio
     async def test_apply_template_success(
         self,
@@ -542,6 +974,61 @@ class TestScheduleTemplates:
         assert response.status_code == 200
         data = response.json()
         assert data["created"] >= 1  # Как минимум 1 слот создан
+    
+    @pytest.mark.asyncio
+    async def test_apply_template_persists_and_skips_conflicts(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        db_session: AsyncSession,
+        admin_user: User,
+        test_playlist: Playlist,
+    ):
+        """Слоты шаблона сохраняются, повторное применение пропускает пересечения."""
+        template = ScheduleTemplate(
+            name="Test Template",
+            user_id=admin_user.id,
+            slots=[
+                {"start_time": "09:00", "end_time": "11:00",
+                 "playlist_id": str(test_playlist.id), "title": "Template Slot"},
+                {"start_time": "10:00", "end_time": "12:00", "title": "Overlapping Slot"},
+            ],
+        )
+        db_session.add(template)
+        await db_session.commit()
+        await db_session.refresh(template)
+        
+        today = date.today()
+        payload = {
+            "template_id": str(template.id),
+            "channel_id": TEST_CHANNEL_ID,
+            "target_dates": [str(today), str(today + timedelta(days=1))],
+        }
+        response = await async_client.post(
+            "/api/schedule/templates/apply", json=payload, headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+        assert response.json()["skipped"] == 2
+        
+        response = await async_client.post(
+            "/api/schedule/templates/apply", json=payload, headers=admin_auth_headers
+        )
+        assert response.json()["created"] == 0
+        assert response.json()["skipped"] == 4
+        
+        response = await async_client.get(
+            "/api/schedule/slots",
+            params={
+                "channel_id": TEST_CHANNEL_ID,
+                "start_date": str(today),
+                "end_date": str(today + timedelta(days=1)),
+            },
+            headers=admin_auth_headers,
+        )
+        data = response.json()
+        assert [s["title"] for s in data] == ["Template Slot", "Template Slot"]
+        assert data[0]["playlist_name"] == "Test Playlist"
 
 
 # ==================== Copy Schedule Tests ====================
@@ -575,6 +1062,45 @@ class TestCopySchedule:
         data = response.json()
         assert data["created"] == 3  # Скопировано на 3 даты
     
+    @pytest.mark.asyncio
+    async def test_copy_schedule_persists_and_skips_conflicts(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_slot: ScheduleSlot,
+    ):
+        """Копии сохраняются, повторное копирование пропускает конфликты."""
+        target = date.today() + timedelta(days=1)
+        payload = {
+            "source_date": str(test_slot.start_date),
+            "target_dates": [str(target), str(target)],
+            "channel_id": str(test_slot.channel_id),
+        }
+        response = await async_client.post(
+            "/api/schedule/copy",
+            json=payload,
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["created"] == 1
+        assert response.json()["skipped"] == 1
+        
+        response = await async_client.get(
+            "/api/schedule/slots",
+            params={
+                "channel_id": str(test_slot.channel_id),
+                "start_date": str(target),
+                "end_date": str(target),
+            },
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        slots = response.json()
+        assert len(slots) == 1
+        assert slots[0]["title"] == "Morning Show"
+        assert slots[0]["start_time"] == "10:00"
+        assert slots[0]["playlist_name"] == "Test Playlist"
+    
     @pytest.mark.asyncio
     async def test_copy_schedule_no_slots(
         self,
@@ -626,6 +1152,84 @@ class TestCalendarView:
         # Должны быть дни месяца
         assert len(data) >= 28
     
+    @pytest.mark.asyncio
+    async def test_calendar_reflects_new_slot(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        test_slot: ScheduleSlot,
+    ):
+        """Календарь не отдаёт устаревший кэш после создания слота."""
+        today = date.today()
+        params = {
+            "channel_id": str(test_slot.channel_id),
+            "year": today.year,
+            "month": today.month,
+        }
+        
+        def today_count(days):
+            return next(d["slots_count"] for d in days if d["date"] == str(today))
+        
+        response = await async_client.get(
+            "/api/schedule/calendar", params=params, headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert today_count(response.json()) == 1
+        
+        response = await async_client.post(
+            "/api/schedule/slots",
+            json={
+                "channel_id": str(test_slot.channel_id),
+                "start_date": str(today),
+                "start_time": "14:00",
+                "end_time": "16:00",
+                "title": "Afternoon Show",
+            },
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 201
+        
+        response = await async_client.get(
+            "/api/schedule/calendar", params=params, headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert today_count(response.json()) == 2
+    
+    @pytest.mark.asyncio
+    async def test_calendar_detects_conflicts(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        db_session,
+        admin_user: User,
+        test_slot: ScheduleSlot,
+    ):
+        """Конфликт находится и со слотом, накрывающим несколько следующих."""
+        from src.api.schedule.cache import invalidate_calendar
+        
+        today = date.today()
+        # test_slot 10:00-12:00 накрывает оба слота ниже, сами они не пересекаются
+        for start, end in ((time(10, 30), time(11, 0)), (time(11, 30), time(11, 45))):
+            db_session.add(ScheduleSlot(
+                channel_id=TEST_CHANNEL_ID,
+                created_by=admin_user.id,
+                start_date=today,
+                start_time=start,
+                end_time=end,
+            ))
+        db_session.commit()
+        invalidate_calendar(TEST_CHANNEL_ID)
+        
+        response = await async_client.get(
+            "/api/schedule/calendar",
+            params={"channel_id": TEST_CHANNEL_ID, "year": today.year, "month": today.month},
+            headers=admin_auth_headers,
+        )
+        days = {d["date"]: d for d in response.json()}
+        assert days[str(today)]["slots_count"] == 3
+        assert days[str(today)]["has_conflicts"] is True
+        assert not any(d["has_conflicts"] for key, d in days.items() if key != str(today))
+    
     @pytest.mark.asyncio
     async def test_expand_schedule(
         self,
@@ -665,6 +1269,111 @@ class TestCalendarView:
         data = response.json()
         # Должно быть 8 записей (сегодня + 7 дней)
         assert len(data) == 8
+        assert {item["playlist_name"] for item in data} == {test_playlist.name}
+    
+    @pytest.mark.asyncio
+    async def test_expand_schedule_weekday_rules(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        db_session,
+        admin_user: User,
+    ):
+        """Слоты weekly/weekdays/weekends/custom разворачиваются по дням недели."""
+        monday = date.today() - timedelta(days=date.today().weekday())
+        rules = [
+            (RepeatType.WEEKLY, None, time(6, 0)),
+            (RepeatType.WEEKDAYS, None, time(7, 0)),
+            (RepeatType.WEEKENDS, None, time(8, 0)),
+            (RepeatType.CUSTOM, [1, 3], time(9, 0)),
+        ]
+        for repeat_type, repeat_days, start in rules:
+            db_session.add(ScheduleSlot(
+                channel_id=TEST_CHANNEL_ID,
+                created_by=admin_user.id,
+                start_date=monday,
+                start_time=start,
+                end_time=time(start.hour, 30),
+                repeat_type=repeat_type,
+                repeat_days=repeat_days,
+            ))
+        db_session.commit()
+        
+        response = await async_client.get(
+            "/api/schedule/expand",
+            params={
+                "channel_id": TEST_CHANNEL_ID,
+                "start_date": str(monday),
+                "end_date": str(monday + timedelta(days=13)),
+            },
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        weekdays = {}
+        for item in response.json():
+            day = date.fromisoformat(item["start_date"])
+            weekdays.setdefault(item["start_time"], []).append(day.weekday())
+        assert weekdays["06:00"] == [0, 0]
+        assert weekdays["07:00"] == [0, 1, 2, 3, 4] * 2
+        assert weekdays["08:00"] == [5, 6] * 2
+        assert weekdays["09:00"] == [1, 3] * 2
+    
+    @pytest.mark.asyncio
+    async def test_expand_schedule_ended_before_range(
+        self,
+        async_client: AsyncClient,
+        admin_auth_headers: dict,
+        db_session,
+        admin_user: User,
+    ):
+        """Повторяющийся слот, закончившийся до диапазона, не разворачивается."""
+        today = date.today()
+        db_session.add(ScheduleSlot(
+            channel_id=TEST_CHANNEL_ID,
+            created_by=admin_user.id,
+            start_date=today - timedelta(days=10),
+            start_time=time(6, 0),
+            end_time=time(7, 0),
+            repeat_type=RepeatType.DAILY,
+            repeat_until=today - timedelta(days=3),
+        ))
+        db_session.commit()
+        
+        response = await async_client.get(
+            "/api/schedule/expand",
+            params={
+                "channel_id": TEST_CHANNEL_ID,
+                "start_date": str(today),
+                "end_date": str(today + timedelta(days=6)),
+            },
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_expand_occurrences_stmt_postgres(self):
+        """Запрос развёртывания для PostgreSQL строится через generate_series."""
+        from uuid import UUID
+        from sqlalchemy.dialects import postgresql
+        from src.api.schedule.utils import expand_occurrences_stmt
+        
+        stmt = expand_occurrences_stmt(
+            UUID(TEST_CHANNEL_ID), date.today(), date.today() + timedelta(days=7)
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "JOIN LATERAL generate_series" in sql
+        assert "interval '1 day'" in sql
+        assert "EXTRACT(isodow FROM occ.value)" in sql
+        # Одноразовый слот разворачивается только в свою дату
+        assert "CASE WHEN (schedule_slots.repeat_type = " in sql
+        assert "THEN schedule_slots.start_date" in sql
+        
+        stmt = expand_occurrences_stmt(
+            UUID(TEST_CHANNEL_ID), date.today(), date.today() + timedelta(days=7),
+            ScheduleSlot.id, ScheduleSlot.start_time
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("SELECT schedule_slots.id, schedule_slots.start_time, CAST(occ.value AS DATE)")
 
 
 # ==================== Edge Cases Tests ====================
@@ -696,7 +1405,22 @@ class TestEdgeCases:
         )
         # Система должна корректно обработать переход через полночь или вернуть validation/error code
         assert response.status_code in [201, 422, 400]
-    
+
+    def test_busy_intervals_merge_and_overlap(self):
+        """Занятые интервалы объединяются, смежные слоты не конфликтуют."""
+        from src.api.schedule.utils import BusyIntervals
+
+        busy = BusyIntervals()
+        busy.add(time(10, 0), time(11, 0))
+        busy.add(time(14, 0), time(15, 0))
+        busy.add(time(10, 30), time(12, 0))  # пересекается с первым
+
+        assert busy.overlaps(time(11, 30), time(13, 0))
+        assert busy.overlaps(time(9, 0), time(10, 1))
+        assert not busy.overlaps(time(12, 0), time(14, 0))
+        assert not busy.overlaps(time(8, 0), time(10, 0))
+        assert not busy.overlaps(time(15, 0), time(16, 0))
+
     @pytest.mark.asyncio
     async def test_very_long_playlist_name(
         self,
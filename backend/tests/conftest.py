@@ -21,6 +21,9 @@ if not os.getenv("SESSION_ENCRYPTION_KEY"):
 if not os.getenv("JWT_SECRET"):
     os.environ["JWT_SECRET"] = "test_jwt_secret_key_for_testing_only"
 
+# Unplanned lazy loads fail loudly in tests
+os.environ.setdefault("SQLALCHEMY_STRICT_LOADING", "1")
+
 # Add backend/src and project root to sys.path so tests can import all packages
 backend_root = os.path.realpath(os.path.join(os.path.dirname(__file__), '..'))
 project_root = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -425,6 +428,30 @@ def clear_rate_limit_storage():
         pass
 
 
+@pytest.fixture(autouse=True)
+def clear_schedule_memory_caches():
+    """Clear in-process schedule caches (calendar, active playlist) between tests."""
+    # Same as above: the app imports 'api.schedule.cache' while tests may
+    # import 'src.api.schedule.cache', so clear both module instances.
+    def _clear():
+        try:
+            import src.api.schedule.cache as cache
+            cache._calendar_cache.clear()
+            cache._active_playlist_cache.clear()
+        except Exception:
+            pass
+        try:
+            import api.schedule.cache as bare_cache
+            bare_cache._calendar_cache.clear()
+            bare_cache._active_playlist_cache.clear()
+        except Exception:
+            pass
+
+    _clear()
+    yield
+    _clear()
+
+
 @pytest.fixture(scope="function")
 def test_playlist(db_session, admin_user: User) -> Playlist:
     """Global test playlist fixture used in multiple model tests."""
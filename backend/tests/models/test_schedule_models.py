@@ -86,6 +86,15 @@ class TestPlaylistModel:
         if hasattr(playlist, 'total_duration'):
             assert playlist.total_duration == 720
     
+    def test_playlist_items_stats_unknown_duration(self):
+        """Элементы без длительности (null) считаются нулевыми."""
+        stats = Playlist.items_stats([
+            {"url": "url1", "duration": 180},
+            {"url": "url2", "duration": None},
+            {"url": "url3"},
+        ])
+        assert stats == {"items_count": 3, "total_duration": 180}
+    
     @pytest.mark.asyncio
     async def test_playlist_cascade_delete(
         self, 
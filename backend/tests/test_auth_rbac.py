@@ -32,3 +32,14 @@ def test_admin_jwt_contains_admin_role():
     
     assert "role" in payload
     assert payload["role"] == "admin"
+
+def test_user_is_admin_ignores_role_case():
+    """
+    Test that User.is_admin accepts admin roles in any case.
+    """
+    from src.models.user import User, UserRole
+
+    assert User(role="ADMIN").is_admin
+    assert User(role="SuperAdmin").is_admin
+    assert User(role=UserRole.ADMIN).is_admin
+    assert not User(role="user").is_admin
@@ -322,6 +322,25 @@ class TestExportFormat:
         from prometheus_client import CONTENT_TYPE_LATEST
         
         assert "text/plain" in CONTENT_TYPE_LATEST or "openmetrics" in CONTENT_TYPE_LATEST.lower()
+    
+    def test_db_pool_metrics_exported(self):
+        """Test pool gauges read live counters from the SQLAlchemy pool."""
+        from prometheus_client import generate_latest
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.pool import QueuePool
+        from src.services.prometheus_metrics import observe_db_pool
+        
+        engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+        observe_db_pool(engine.pool)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            output = generate_latest().decode()
+            assert 'sattva_db_pool_connections{state="size"} 3.0' in output
+            assert 'sattva_db_pool_connections{state="checked_out"} 1.0' in output
+        
+        output = generate_latest().decode()
+        assert 'sattva_db_pool_connections{state="checked_out"} 0.0' in output
+        engine.dispose()
 
 
 # === Test: Thread Safety ===